@@ -1,7 +1,8 @@
 __version__ = "0.1.0"
 
 from .ps_set import PrioritySearchSet
+from .ps_tree import ItemHandle
 from .ps_tree import PrioritySearchTree
 from .ps_tree_node import Node
 
-__all__ = ["PrioritySearchTree", "PrioritySearchSet", "Node"]
+__all__ = ["PrioritySearchTree", "PrioritySearchSet", "ItemHandle", "Node"]
@@ -88,6 +88,92 @@ class PrioritySearchSet(MutableSet):
         """
         return self._values[self._pst.get_with_max_priority()]
 
+    def max_in_range(self, left: _V, right: _V) -> _V:
+        """Return the item with the largest **priority** among items with **key** in range defined by `left` and
+        `right` items.
+
+        Args:
+            left: Left bound of the range (**key** is used to compare).
+            right: Right bound of the range (**key** is used to compare).
+
+        Returns:
+            item with the largest **priority** in the range
+
+        Raises:
+            KeyError: If there are no items in the range
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PSS
+        """
+        return self._values[self._pst.max_in_range(self.key_func(left), self.key_func(right))]
+
+    def min_key_query(self, left: _V, right: _V, bottom: _V) -> _V:
+        """Return the item with the smallest **key** that satisfy 3 sided query criteria.
+
+        This function returns the item with the smallest **key** among items that meet the following criteria:
+            1. items have **key** grater or equal to **key** of `left` argument
+            2. items have **key** smaller or equal to **key** of `right` argument
+            3. items have **priority** grater or equal to **priority** of `bottom` argument
+
+        Args:
+            left: Left bound for query (**key** is used to compare).
+            right: Right bound for query (**key** is used to compare).
+            bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            item with the smallest **key** that satisfy criteria
+
+        Raises:
+            KeyError: If there are no items that satisfy criteria
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PSS
+        """
+        return self._values[self._pst.min_key_query(self.key_func(left), self.key_func(right), self.priority_func(bottom))]
+
+    def max_key_query(self, left: _V, right: _V, bottom: _V) -> _V:
+        """Return the item with the largest **key** that satisfy 3 sided query criteria.
+
+        This function returns the item with the largest **key** among items that meet the following criteria:
+            1. items have **key** grater or equal to **key** of `left` argument
+            2. items have **key** smaller or equal to **key** of `right` argument
+            3. items have **priority** grater or equal to **priority** of `bottom` argument
+
+        Args:
+            left: Left bound for query (**key** is used to compare).
+            right: Right bound for query (**key** is used to compare).
+            bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            item with the largest **key** that satisfy criteria
+
+        Raises:
+            KeyError: If there are no items that satisfy criteria
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PSS
+        """
+        return self._values[self._pst.max_key_query(self.key_func(left), self.key_func(right), self.priority_func(bottom))]
+
+    def skyline(self, left: _V, right: _V) -> list:
+        """Return skyline (Pareto maxima) of items with **key** in range defined by `left` and `right` items.
+
+        Item belongs to skyline if there are no other items in the range with both **key** and **priority** grater
+        or equal to its **key** and **priority**.
+
+        Args:
+            left: Left bound of the range (**key** is used to compare).
+            right: Right bound of the range (**key** is used to compare).
+
+        Returns:
+            List: list of skyline items sorted by **priority** in descending order, or empty list if there are no
+            items in the range
+
+        Complexity:
+            `O((H+1)*log(N))` where **N** is number of items in PSS and **H** is number of returned items
+        """
+        return [self._values[x] for x in self._pst.skyline(self.key_func(left), self.key_func(right))]
+
     def pop(self) -> _V:
         """Remove and return the item with the largest **priority** from the PSS.
 
@@ -102,6 +188,143 @@ class PrioritySearchSet(MutableSet):
         """
         return self._values.pop(self._pst.popitem()[0])
 
+    def drain(self) -> Iterator[_V]:
+        """Remove all items from PSS and iterate over them in descending **priority** order.
+
+        PSS is empty as soon as iteration starts. If iteration is stopped early, items that were not reported are
+        discarded.
+
+        Returns:
+            Iterator: iterator over removed items
+
+        Complexity:
+            `O(log(N))` per reported item where **N** is number of items in PSS
+        """
+        values = self._values
+        self._values = {}
+        for key, _ in self._pst.drain():
+            yield values[key]
+
+    def pushpop(self, value: _V) -> _V:
+        """Add item to PSS, then remove and return the item with the largest **priority**.
+
+        Works like :func:`heapq.heappushpop`.
+
+        Args:
+            value: Value to insert into PSS
+
+        Returns:
+            item with the largest **priority**
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PSS, `O(1)` if the new item has the largest **priority**
+            and its **key** is not in PSS
+        """
+        key = self.key_func(value)
+        priority = self.priority_func(value)
+        if key in self._values:
+            self._pst.update_priority(key, priority)
+            self._values[key] = value
+            return self.pop()
+
+        if not self._values:
+            return value
+        # membership is known from values, so the max item is compared without searching the tree
+        max_key = self._pst.get_with_max_priority()
+        if (priority, key) > (self.priority_func(self._values[max_key]), max_key):
+            return value
+
+        self._pst.replace_max(key, priority)
+        self._values[key] = value
+        return self._values.pop(max_key)
+
+    def replace_max(self, value: _V) -> _V:
+        """Remove and return the item with the largest **priority**, then add item to PSS.
+
+        Works like :func:`heapq.heapreplace`.
+
+        Args:
+            value: Value to insert into PSS
+
+        Returns:
+            item with the largest **priority**
+
+        Raises:
+            KeyError: If the PSS is empty
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PSS
+        """
+        key = self.key_func(value)
+        result = self._values.pop(self._pst.replace_max(key, self.priority_func(value))[0])
+        self._values[key] = value
+        return result
+
+    def nlargest(self, k: int) -> list:
+        """Returns `k` items with the largest **priority** without removing them.
+
+        Args:
+            k (int): Number of items to return
+
+        Returns:
+            List: items in descending **priority** order
+
+        Complexity:
+            `O(k*log(k))`
+        """
+        return [self._values[x[0]] for x in self._pst.nlargest(k)]
+
+    def pop_many(self, k: int) -> list:
+        """Remove and return `k` items with the largest **priority**.
+
+        Args:
+            k (int): Number of items to remove. All items are removed if `k` is grater than number of items in PSS
+
+        Returns:
+            List: removed items in descending **priority** order
+
+        Complexity:
+            `O(k*log(N))` where **N** is number of items in PSS, `O(N)` if at most a quarter of items remains
+        """
+        return [self._values.pop(x[0]) for x in self._pst.pop_many(k)]
+
+    def pop_max_in_range(self, left: _V, right: _V) -> _V:
+        """Remove and return the item with the largest **priority** among items with **key** in range defined by
+        `left` and `right` items.
+
+        Args:
+            left: Left bound of the range (**key** is used to compare).
+            right: Right bound of the range (**key** is used to compare).
+
+        Returns:
+            item with the largest **priority** in the range
+
+        Raises:
+            KeyError: If there are no items in the range
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PSS
+        """
+        return self._values.pop(self._pst.pop_max_in_range(self.key_func(left), self.key_func(right))[0])
+
+    def pop_query(self, left: _V, right: _V, bottom: _V) -> list:
+        """Performs 3 sided query on PSS and removes all found items.
+
+        Args:
+            left: Left bound for query (**key** is used to compare).
+            right: Right bound for query (**key** is used to compare).
+            bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            List: list of removed items, or empty list if no items found
+
+        Complexity:
+            `O(K*log(N))` where **N** is number of items in PSS and **K** is number of removed items,
+            `O(N)` if at most a quarter of items remains
+        """
+        removed = self._pst.pop_query(self.key_func(left), self.key_func(right), self.priority_func(bottom))
+        return [self._values.pop(x[0]) for x in removed]
+
     def add(self, value: _V) -> None:
         """Add new item to priority search Set.
 
@@ -141,7 +364,7 @@ class PrioritySearchSet(MutableSet):
         del self._pst[key]
         del self._values[key]
 
-    def query(self, left: _V, right: _V, bottom: _V) -> list:
+    def query(self, left: _V, right: _V, bottom: _V, items_limit: int = 0) -> list:
         """Performs 3 sided query on PSS.
 
         This function returns list of items that meet the following criteria:
@@ -153,6 +376,8 @@ class PrioritySearchSet(MutableSet):
             left: Left bound for query (**key** is used to compare).
             right: Right bound for query (**key** is used to compare).
             bottom: Bottom bound for query (**priority** is used to compare).
+            items_limit (int): Number of items to return. Default value is ``0`` - no limit.
+                Traversal stops as soon as `items_limit` items are found, returned items are not sorted.
 
         Returns:
             List: list of items that satisfy criteria, or empty list if no items found
@@ -163,7 +388,112 @@ class PrioritySearchSet(MutableSet):
         key_left = self.key_func(left)
         key_right = self.key_func(right)
         priority_bottom = self.priority_func(bottom)
-        return [self._values[x] for x in self._pst.query(key_left, key_right, priority_bottom)]
+        return [self._values[x] for x in self._pst.query(key_left, key_right, priority_bottom, items_limit)]
+
+    def ordered_query(
+        self, left: _V, right: _V, bottom: _V, items_limit: int = 0, after: Optional[_V] = None, reverse: bool = False
+    ) -> list:
+        """Performs 3 sided query on PSS and returns items sorted by **key**.
+
+        This function returns list of items that meet the following criteria:
+            1. items have **key** grater or equal to **key** of `left` argument
+            2. items have **key** smaller or equal to **key** of `right` argument
+            3. items have **priority** grater or equal to **priority** of `bottom` argument
+
+        Results can be paginated: pass the last item of the previous page as `after` to get the next page.
+
+        Args:
+            left: Left bound for query (**key** is used to compare).
+            right: Right bound for query (**key** is used to compare).
+            bottom: Bottom bound for query (**priority** is used to compare).
+            items_limit (int): Number of items to return. Default value is ``0`` - no limit.
+            after: Only items with **key** grater than **key** of `after` (smaller in case of reverse order) are
+                returned. Default value is ``None`` - no restriction.
+            reverse (bool): If ``True`` items are sorted by **key** in descending order. Default value is ``False``
+
+        Returns:
+            List: list of items that satisfy criteria sorted by **key**, or empty list if no items found
+
+        Complexity:
+            `O(log(N)+K)` where **N** is number of items in PSS and **K** is number of returned items
+        """
+        key_left = self.key_func(left)
+        key_right = self.key_func(right)
+        priority_bottom = self.priority_func(bottom)
+        after_key = None if after is None else self.key_func(after)
+        keys = self._pst.ordered_query(key_left, key_right, priority_bottom, items_limit, after_key, reverse)
+        return [self._values[x] for x in keys]
+
+    def iquery(self, left: _V, right: _V, bottom: _V) -> Iterator[_V]:
+        """Performs lazy 3 sided query on PSS.
+
+        This function returns iterator over items that meet the following criteria:
+            1. items have **key** grater or equal to **key** of `left` argument
+            2. items have **key** smaller or equal to **key** of `right` argument
+            3. items have **priority** grater or equal to **priority** of `bottom` argument
+
+        Args:
+            left: Left bound for query (**key** is used to compare).
+            right: Right bound for query (**key** is used to compare).
+            bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            Iterator: iterator over items that satisfy criteria
+
+        Complexity:
+            `O(log(N)+K)` where **N** is number of items in PSS and **K** is number of reported items.
+            Memory usage is `O(log(N))`
+
+        Note:
+            PSS must not be modified while iterating
+        """
+        key_left = self.key_func(left)
+        key_right = self.key_func(right)
+        priority_bottom = self.priority_func(bottom)
+        for key in self._pst.iquery(key_left, key_right, priority_bottom):
+            yield self._values[key]
+
+    def count_query(self, left: _V, right: _V, bottom: _V) -> int:
+        """Counts items that satisfy 3 sided query criteria.
+
+        This function returns number of items that meet the following criteria:
+            1. items have **key** grater or equal to **key** of `left` argument
+            2. items have **key** smaller or equal to **key** of `right` argument
+            3. items have **priority** grater or equal to **priority** of `bottom` argument
+
+        Args:
+            left: Left bound for query (**key** is used to compare).
+            right: Right bound for query (**key** is used to compare).
+            bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            int: number of items that satisfy criteria
+
+        Complexity:
+            `O(log(N)+K)` where **N** is number of items in PSS and **K** is number of counted items
+        """
+        return self._pst.count_query(self.key_func(left), self.key_func(right), self.priority_func(bottom))
+
+    def any_query(self, left: _V, right: _V, bottom: _V) -> bool:
+        """Checks if there is any item that satisfy 3 sided query criteria.
+
+        This function checks if PSS contains item that meet the following criteria:
+            1. item has **key** grater or equal to **key** of `left` argument
+            2. item has **key** smaller or equal to **key** of `right` argument
+            3. item has **priority** grater or equal to **priority** of `bottom` argument
+
+        Args:
+            left: Left bound for query (**key** is used to compare).
+            right: Right bound for query (**key** is used to compare).
+            bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            bool: ``True`` if at least one item satisfy criteria, ``False`` otherwise.
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PSS
+        """
+        return self._pst.any_query(self.key_func(left), self.key_func(right), self.priority_func(bottom))
 
     def sorted_query(self, left: _V, right: _V, bottom: _V, items_limit: int = 0) -> list:
         """Performs sorted 3 sided query on PSS.
@@ -1,15 +1,59 @@
+import heapq
+from bisect import insort
+from itertools import chain
+from itertools import islice
 from typing import Iterable
 from typing import Iterator
 from typing import MutableMapping
 from typing import Optional
 from typing import Tuple
 from typing import TypeVar
+from typing import Union
 
 from .ps_tree_node import Node
 
 _KEY = TypeVar("_KEY")
 _PRIORITY = TypeVar("_PRIORITY")
 
+# PST is rebuilt instead of removing items one by one if 1/_REBUILD_RATIO or less of items remain
+_REBUILD_RATIO = 4
+
+
+class _MaxHeapItem:
+    """Wraps a node to be stored in :mod:`heapq`, node with the largest **heap_key** goes first."""
+
+    __slots__ = ["node"]
+
+    def __init__(self, node: Node) -> None:
+        self.node: Node = node
+
+    def __lt__(self, other: "_MaxHeapItem") -> bool:
+        return self.node.heap_key > other.node.heap_key
+
+
+class ItemHandle:
+    """Reference to an item of :class:`PrioritySearchTree` returned by :meth:`PrioritySearchTree.insert`.
+
+    Handle can be passed to :meth:`PrioritySearchTree.update_priority` and ``del`` instead of the **key**,
+    so the **key** is not searched in the tree. Handle stays valid while the item is in PST.
+
+    Attributes:
+        key: **key** of the item
+        node (Node): node that stores the item, ``None`` if the item was removed from PST
+    """
+
+    __slots__ = ["key", "node"]
+
+    def __init__(self, key: _KEY, node: Optional[Node]) -> None:
+        self.key: _KEY = key
+        self.node: Optional[Node] = node
+
+
+def _to_items(heap_keys: Iterable[Tuple[_PRIORITY, _KEY]], with_priority: bool) -> list:
+    if with_priority:
+        return [(heap_key[1], heap_key[0]) for heap_key in heap_keys]
+    return [heap_key[1] for heap_key in heap_keys]
+
 
 class PrioritySearchTree(MutableMapping):
     """Class that represents Priority search tree.
@@ -44,6 +88,9 @@ class PrioritySearchTree(MutableMapping):
             Each item in the iterable must itself be an iterable with exactly two objects.
             The first object of each item becomes a **key** in the new pst, and the second object the corresponding
             **priority**. The default value is ``None``.
+        indexed (bool): If ``True`` PST maintains a hash index from **key** to the node that stores it, so
+            point lookups take `O(1)` and :meth:`update_priority` does not search for the **key**.
+            **Keys** must be hashable. The default value is ``False``.
 
     Raises:
         KeyError: in case if iterable contains values with not unique **key**
@@ -52,60 +99,63 @@ class PrioritySearchTree(MutableMapping):
         `O(N*log(N))` where **N** is number of items to be added to new PST
     """
 
-    __slots__ = ["_root", "_len"]
+    __slots__ = ["_root", "_len", "_index"]
 
     def _push_down(self, node: Node, heap_key: Tuple[_PRIORITY, _KEY]) -> None:
+        index = self._index
+        while node.heap_key[0] != Node.PLACEHOLDER_VALUE:
+            if index is not None:
+                index[heap_key[1]].node = node
+            node.heap_key, heap_key = heap_key, node.heap_key
+            if heap_key[1] < node.tree_key:
+                node = node.left
+            else:
+                node = node.right
 
-        if node.heap_key[0] == Node.PLACEHOLDER_VALUE:
-            node.heap_key = heap_key
-            return
-
-        if node.heap_key[1] < node.tree_key:
-            self._push_down(node.left, node.heap_key)
-        else:
-            self._push_down(node.right, node.heap_key)
-
+        if index is not None and heap_key[0] != Node.PLACEHOLDER_VALUE:
+            index[heap_key[1]].node = node
         node.heap_key = heap_key
 
     def _sift_down(self, node: Node, heap_key: Tuple[_PRIORITY, _KEY]) -> None:
+        while node.heap_key[0] != Node.PLACEHOLDER_VALUE:
+            if heap_key > node.heap_key:
+                self._push_down(node, heap_key)
+                return
 
-        if node.heap_key[0] == Node.PLACEHOLDER_VALUE:
-            node.heap_key = heap_key
-            return
-
-        if heap_key > node.heap_key:
-            self._push_down(node, heap_key)
-            return
+            if heap_key[1] < node.tree_key:
+                node = node.left
+            else:
+                node = node.right
 
-        if heap_key[1] < node.tree_key:
-            self._sift_down(node.left, heap_key)
-        else:
-            self._sift_down(node.right, heap_key)
+        if self._index is not None:
+            self._index[heap_key[1]].node = node
+        node.heap_key = heap_key
 
     def _push_up(self, node: Node) -> None:
-        if node.heap_key[0] == Node.PLACEHOLDER_VALUE:
-            return
-
-        if node.left.heap_key[0] == Node.PLACEHOLDER_VALUE:
-            node.heap_key = node.right.heap_key
-            self._push_up(node.right)
-            return
-
-        if node.right.heap_key[0] == Node.PLACEHOLDER_VALUE:
-            node.heap_key = node.left.heap_key
-            self._push_up(node.left)
-            return
-
-        if node.left.heap_key >= node.right.heap_key:
-            node.heap_key = node.left.heap_key
-            self._push_up(node.left)
-        else:
-            node.heap_key = node.right.heap_key
-            self._push_up(node.right)
+        placeholder = Node.PLACEHOLDER_VALUE
+        index = self._index
+        heap_key = node.heap_key
+        while heap_key[0] != placeholder:
+            left = node.left
+            right = node.right
+            heap_key = left.heap_key
+            if heap_key[0] == placeholder:
+                heap_key = right.heap_key
+                child = right
+            elif right.heap_key[0] != placeholder and right.heap_key > heap_key:
+                heap_key = right.heap_key
+                child = right
+            else:
+                child = left
+            node.heap_key = heap_key
+            if index is not None and heap_key[0] != placeholder:
+                index[heap_key[1]].node = node
+            node = child
 
-    def __init__(self, iterable: Optional[Iterable[Tuple[_KEY, _PRIORITY]]] = None) -> None:
+    def __init__(self, iterable: Optional[Iterable[Tuple[_KEY, _PRIORITY]]] = None, indexed: bool = False) -> None:
         self._root: Node = Node.NULL_NODE
         self._len: int = 0
+        self._index: Optional[dict] = {} if indexed else None
 
         if iterable:
             sn = sorted(iterable)
@@ -115,39 +165,116 @@ class PrioritySearchTree(MutableMapping):
                     raise KeyError(f"More than one item with key:{current_key[0]}")
                 current_key = next_key
 
-            sn_len = len(sn)
-            sn_iter = iter(sn)
-            tree_nodes = []
-            lvl = sn_len.bit_length()
-            for _ in range(sn_len - 2 ** (lvl - 1)):
-                keys = next(sn_iter)
-                ln = Node(tree_key=keys[0], heap_key=(keys[1], keys[0]))
-                keys = next(sn_iter)
-                rn = Node(tree_key=keys[0], heap_key=(keys[1], keys[0]))
-                pn = Node(tree_key=rn.tree_key, heap_key=(keys[1], keys[0]), color=0)
+            self._build(sn)
+
+    def _build(self, sn: list) -> None:
+        # Builds balanced PST from (key, priority) pairs sorted by key in O(N).
+        if not sn:
+            self.clear()
+            return
+
+        # index is filled in one pass after the tree is built
+        index = self._index
+        self._index = None
+
+        sn_len = len(sn)
+        sn_iter = iter(sn)
+        tree_nodes = []
+        lvl = sn_len.bit_length()
+        for _ in range(sn_len - 2 ** (lvl - 1)):
+            keys = next(sn_iter)
+            ln = Node(tree_key=keys[0], heap_key=(keys[1], keys[0]))
+            keys = next(sn_iter)
+            rn = Node(tree_key=keys[0], heap_key=(keys[1], keys[0]))
+            pn = Node(tree_key=rn.tree_key, heap_key=(keys[1], keys[0]), color=0)
+            pn.set_left(ln)
+            pn.set_right(rn)
+            self._push_up(pn)
+            tree_nodes.append((pn, ln.tree_key, rn.tree_key))
+
+        for keys in sn_iter:
+            pn = Node(tree_key=keys[0], heap_key=(keys[1], keys[0]), color=0)
+            tree_nodes.append((pn, pn.tree_key, pn.tree_key))
+
+        while len(tree_nodes) > 1:
+            new_nodes = []
+            for i in range(0, len(tree_nodes), 2):
+                ln, ln_min, ln_max = tree_nodes[i]
+                rn, rn_min, rn_max = tree_nodes[i + 1]
+                pn = Node(tree_key=rn_min, heap_key=ln.heap_key, color=0)
                 pn.set_left(ln)
                 pn.set_right(rn)
                 self._push_up(pn)
-                tree_nodes.append((pn, ln.tree_key, rn.tree_key))
-
-            for keys in sn_iter:
-                pn = Node(tree_key=keys[0], heap_key=(keys[1], keys[0]), color=0)
-                tree_nodes.append((pn, pn.tree_key, pn.tree_key))
-
-            while len(tree_nodes) > 1:
-                new_nodes = []
-                for i in range(0, len(tree_nodes), 2):
-                    ln, ln_min, ln_max = tree_nodes[i]
-                    rn, rn_min, rn_max = tree_nodes[i + 1]
-                    pn = Node(tree_key=rn_min, heap_key=ln.heap_key, color=0)
-                    pn.set_left(ln)
-                    pn.set_right(rn)
-                    self._push_up(pn)
-                    new_nodes.append((pn, ln_min, rn_max))
-                tree_nodes = new_nodes
-
-            self._root = tree_nodes[0][0]
-            self._len = sn_len
+                new_nodes.append((pn, ln_min, rn_max))
+            tree_nodes = new_nodes
+
+        self._root = tree_nodes[0][0]
+        self._len = sn_len
+        if index is not None:
+            self._fill_index(index)
+            self._index = index
+
+    def _fill_index(self, index: dict) -> None:
+        # Points handles of all items to the nodes that store them, creates missing handles.
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            heap_key = node.heap_key
+            if heap_key[0] != Node.PLACEHOLDER_VALUE:
+                handle = index.get(heap_key[1])
+                if handle is None:
+                    index[heap_key[1]] = ItemHandle(heap_key[1], node)
+                else:
+                    handle.node = node
+                stack.append(node.left)
+                stack.append(node.right)
+
+    @staticmethod
+    def _sorted_items(node: Node) -> list:
+        # Collects (key, priority) pairs stored in the subtree of the node sorted by key.
+        items = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            heap_key = node.heap_key
+            if heap_key[0] != Node.PLACEHOLDER_VALUE:
+                items.append((heap_key[1], heap_key[0]))
+                stack.append(node.left)
+                stack.append(node.right)
+        items.sort()
+        return items
+
+    def _remove_many(self, heap_nodes: list) -> list:
+        # Removes heap entries stored in heap_nodes (ancestors go before descendants), returns removed heap keys.
+        heap_keys = [node.heap_key for node in heap_nodes]
+        if (self._len - len(heap_keys)) * _REBUILD_RATIO > self._len:
+            # leaves are found before the tree is changed, leaf nodes of other keys are never replaced
+            leaves = [self._find_leaf(heap_key[1], node) for heap_key, node in zip(heap_keys, heap_nodes)]
+            # descendants are emptied before their ancestors, so every push up pulls only remaining entries
+            for node in reversed(heap_nodes):
+                self._push_up(node)
+            if self._index is not None:
+                for heap_key in heap_keys:
+                    self._index.pop(heap_key[1]).node = None
+            # structural removal is not batched, every leaf is cut and rebalanced on its own
+            for leaf_node in leaves:
+                self._cut_leaf(leaf_node)
+            return heap_keys
+
+        # removing a large part of items costs more than building the tree again from remaining items
+        removed_keys = sorted(heap_key[1] for heap_key in heap_keys)
+        if self._index is not None:
+            for key in removed_keys:
+                self._index.pop(key).node = None
+        remaining = []
+        i = 0
+        for item in self._sorted_items(self._root):
+            if i < len(removed_keys) and item[0] == removed_keys[i]:
+                i += 1
+            else:
+                remaining.append(item)
+        self._build(remaining)
+        return heap_keys
 
     def get_with_max_priority(self) -> _KEY:
         """Returns the **key** with the largest **priority** in PST.
@@ -165,6 +292,278 @@ class PrioritySearchTree(MutableMapping):
             raise KeyError
         return self._root.heap_key[1]
 
+    def max_in_range(self, key_left: _KEY, key_right: _KEY) -> _KEY:
+        """Returns the **key** with the largest **priority** among **keys** in range [`key_left`, `key_right`].
+
+        Args:
+            key_left: Left bound of the range (**key** is used to compare).
+            key_right: Right bound of the range (**key** is used to compare).
+
+        Returns:
+            **key** with the largest **priority** in the range
+
+        Raises:
+            KeyError: If there are no **keys** in the range
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST
+        """
+        node = self._range_max_node(key_left, key_right)
+        if node is None:
+            raise KeyError(f"No keys in range:[{key_left}, {key_right}]")
+        return node.heap_key[1]
+
+    def min_key_query(self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY) -> _KEY:
+        """Returns the smallest **key** that satisfy 3 sided query criteria.
+
+        This function returns the smallest **key** of items that meet the following criteria:
+            1. items have **key** grater or equal to `key_left` argument
+            2. items have **key** smaller or equal to `key_right` argument
+            3. items have **priority** grater or equal to `priority_bottom` argument
+
+        Args:
+            key_left: Left bound for query (**key** is used to compare).
+            key_right: Right bound for query (**key** is used to compare).
+            priority_bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            the smallest **key** that satisfy criteria
+
+        Raises:
+            KeyError: If there are no items that satisfy criteria
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST
+        """
+        heap_key = self._extreme_key_query(key_left, key_right, priority_bottom, False)
+        if heap_key is None:
+            raise KeyError("No items satisfy criteria")
+        return heap_key[1]
+
+    def max_key_query(self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY) -> _KEY:
+        """Returns the largest **key** that satisfy 3 sided query criteria.
+
+        This function returns the largest **key** of items that meet the following criteria:
+            1. items have **key** grater or equal to `key_left` argument
+            2. items have **key** smaller or equal to `key_right` argument
+            3. items have **priority** grater or equal to `priority_bottom` argument
+
+        Args:
+            key_left: Left bound for query (**key** is used to compare).
+            key_right: Right bound for query (**key** is used to compare).
+            priority_bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            the largest **key** that satisfy criteria
+
+        Raises:
+            KeyError: If there are no items that satisfy criteria
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST
+        """
+        heap_key = self._extreme_key_query(key_left, key_right, priority_bottom, True)
+        if heap_key is None:
+            raise KeyError("No items satisfy criteria")
+        return heap_key[1]
+
+    def nearest_query(self, key: _KEY, priority_bottom: _PRIORITY) -> _KEY:
+        """Returns the **key** nearest to the given `key` among items with **priority** grater or equal to
+        `priority_bottom`.
+
+        Distance between **keys** is calculated as their difference, so **keys** must support subtraction.
+        In case of a tie, the smaller **key** is returned.
+
+        Args:
+            key: **key** to search around (it does not have to exist in PST).
+            priority_bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            the nearest **key** that has **priority** grater or equal to `priority_bottom`
+
+        Raises:
+            KeyError: If there are no items that satisfy criteria
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST
+        """
+        if self._root == Node.NULL_NODE:
+            raise KeyError("No items satisfy criteria")
+
+        key_min, key_max = self._key_bounds()
+        left = self._extreme_key_query(key_min, key, priority_bottom, True)
+        right = self._extreme_key_query(key, key_max, priority_bottom, False)
+        if left is None and right is None:
+            raise KeyError("No items satisfy criteria")
+        if right is None or (left is not None and key - left[1] <= right[1] - key):
+            return left[1]
+        return right[1]
+
+    def bucket_maxima(self, key_left: _KEY, key_right: _KEY, boundaries: Iterable[_KEY]) -> list:
+        """Splits range [`key_left`, `key_right`] into buckets and returns the **key** with the largest **priority**
+        in every bucket.
+
+        Example::
+
+            # buckets are [0, 10), [10, 20) and [20, 30]
+            result = pst.bucket_maxima(0, 30, [10, 20])
+
+        Args:
+            key_left: Left bound of the range (**key** is used to compare).
+            key_right: Right bound of the range (**key** is used to compare).
+            boundaries (Iterable): Sorted **keys** that split the range into buckets. Each boundary is the left
+                (inclusive) bound of the next bucket.
+
+        Returns:
+            List: list with the **key** with the largest **priority** for every bucket, ``None`` is used for empty
+            buckets
+
+        Raises:
+            ValueError: If boundaries are not sorted or not in range [`key_left`, `key_right`]
+
+        Complexity:
+            `O(M*log(N))` where **N** is number of items in PST and **M** is number of buckets
+        """
+        result = []
+        bucket_left = key_left
+        for boundary in boundaries:
+            if boundary < bucket_left or key_right < boundary:
+                raise ValueError(f"Boundaries must be sorted and within range:[{key_left}, {key_right}]")
+            node = self._range_max_node(bucket_left, boundary, right_open=True)
+            result.append(None if node is None else node.heap_key[1])
+            bucket_left = boundary
+        node = self._range_max_node(bucket_left, key_right)
+        result.append(None if node is None else node.heap_key[1])
+        return result
+
+    def skyline(self, key_left: _KEY, key_right: _KEY) -> list:
+        """Returns skyline (Pareto maxima) of items with **key** in range [`key_left`, `key_right`].
+
+        Item belongs to skyline if there are no other items in the range with both **key** and **priority** grater
+        or equal to its **key** and **priority**.
+
+        Args:
+            key_left: Left bound of the range (**key** is used to compare).
+            key_right: Right bound of the range (**key** is used to compare).
+
+        Returns:
+            List: list of skyline **keys** sorted by **priority** in descending order (which is also ascending order
+            of **keys**), or empty list if there are no items in the range
+
+        Complexity:
+            `O((H+1)*log(N))` where **N** is number of items in PST and **H** is number of returned items
+        """
+        result = []
+        node = self._range_max_node(key_left, key_right)
+        while node is not None:
+            key = node.heap_key[1]
+            result.append(key)
+            node = self._range_max_node(key, key_right, left_open=True)
+        return result
+
+    def prune(self, key_left: _KEY, key_right: _KEY, priority_below: _PRIORITY) -> int:
+        """Remove all items with **key** in range [`key_left`, `key_right`] and **priority** smaller than
+        `priority_below`.
+
+        Args:
+            key_left: Left bound of the range (**key** is used to compare).
+            key_right: Right bound of the range (**key** is used to compare).
+            priority_below: Items with **priority** smaller than this value are removed.
+
+        Heap entries of removed items are repaired in one bottom-up pass, but the tree is still rebalanced after
+        every removed item, so this is only moderately faster than removing the items one by one.
+
+        Returns:
+            int: number of removed items
+
+        Complexity:
+            `O(log(N)+M+K*log(N))` where **N** is number of items in PST, **M** is number of items in the range
+            and **K** is number of removed items, `O(N)` if at most a quarter of items remains
+        """
+        heap_nodes = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            heap_key = node.heap_key
+            if heap_key[0] == Node.PLACEHOLDER_VALUE:
+                continue
+
+            if heap_key[0] < priority_below and key_left <= heap_key[1] <= key_right:
+                heap_nodes.append(node)
+
+            if key_right < node.tree_key:
+                stack.append(node.left)
+            elif key_left >= node.tree_key:
+                stack.append(node.right)
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+
+        return len(self._remove_many(heap_nodes))
+
+    def pop_max_in_range(self, key_left: _KEY, key_right: _KEY) -> Tuple[_KEY, _PRIORITY]:
+        """Remove and return (key, priority) pair with the largest **priority** among **keys** in range
+        [`key_left`, `key_right`].
+
+        Args:
+            key_left: Left bound of the range (**key** is used to compare).
+            key_right: Right bound of the range (**key** is used to compare).
+
+        Returns:
+            Tuple: **key** and **priority** pair
+
+        Raises:
+            KeyError: If there are no **keys** in the range
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST
+        """
+        node = self._range_max_node(key_left, key_right)
+        if node is None:
+            raise KeyError(f"No keys in range:[{key_left}, {key_right}]")
+        result = node.heap_key
+        self._remove(result[1], node)
+        return result[1], result[0]
+
+    def pop_query(self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY) -> list:
+        """Performs 3 sided query on PST and removes all found items.
+
+        Args:
+            key_left: Left bound for query (**key** is used to compare).
+            key_right: Right bound for query (**key** is used to compare).
+            priority_bottom: Bottom bound for query (**priority** is used to compare).
+
+        Heap entries of found items are repaired in one bottom-up pass, but the tree is still rebalanced after
+        every removed item, so this is only moderately faster than removing the items one by one.
+
+        Returns:
+            List: list of removed (key, priority) pairs, or empty list if no items found
+
+        Complexity:
+            `O(K*log(N))` where **N** is number of items in PST and **K** is number of removed items,
+            `O(N)` if at most a quarter of items remains
+        """
+        heap_nodes = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            heap_key = node.heap_key
+            if heap_key[0] == Node.PLACEHOLDER_VALUE or heap_key[0] < priority_bottom:
+                continue
+
+            if key_left <= heap_key[1] <= key_right:
+                heap_nodes.append(node)
+
+            if key_right < node.tree_key:
+                stack.append(node.left)
+            elif key_left >= node.tree_key:
+                stack.append(node.right)
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+
+        return _to_items(self._remove_many(heap_nodes), True)
+
     def popitem(self) -> Tuple[_KEY, _PRIORITY]:
         """Remove and return (key, priority) pair from the PST. Pair with max **priority** will be removed.
 
@@ -180,9 +579,126 @@ class PrioritySearchTree(MutableMapping):
         if self._root == Node.NULL_NODE:
             raise KeyError
         result = self._root.heap_key
-        del self[result[1]]
+        self._remove(result[1], self._root)
         return result[1], result[0]
 
+    def drain(self) -> Iterator[Tuple[_KEY, _PRIORITY]]:
+        """Remove all items from PST and iterate over them in descending **priority** order.
+
+        PST is empty as soon as iteration starts. Items are taken from the top of the detached heap one by one and the
+        tree itself is discarded without rebalancing. If iteration is stopped early, items that were not reported are
+        discarded too.
+
+        Returns:
+            Iterator: iterator over removed (**key**, **priority**) pairs
+
+        Complexity:
+            `O(log(N))` per reported item where **N** is number of items in PST, plus `O(N)` if PST is indexed
+        """
+        # items are taken from the detached tree, so PST can be modified while iterating
+        drained = PrioritySearchTree()
+        root = drained._root = self._root
+        self.clear()
+        while root.heap_key[0] != Node.PLACEHOLDER_VALUE:
+            heap_key = root.heap_key
+            drained._push_up(root)
+            yield heap_key[1], heap_key[0]
+
+    def pushpop(self, key: _KEY, priority: _PRIORITY) -> Tuple[_KEY, _PRIORITY]:
+        """Add **key** with given **priority** to PST, then remove and return (key, priority) pair with max **priority**.
+
+        Works like :func:`heapq.heappushpop`. If **key** already exists in PST its **priority** is updated first.
+
+        Args:
+            key: **key** to add
+            priority: **priority** of the **key**
+
+        Returns:
+            Tuple: **key** and **priority** pair with max **priority**
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST, `O(1)` if PST is indexed and the new item has max
+            **priority**
+        """
+        if self._find_heap_node(key) is not None:
+            self.update_priority(key, priority)
+            return self.popitem()
+
+        if self._root == Node.NULL_NODE or (priority, key) > self._root.heap_key:
+            return key, priority
+
+        result = self._root.heap_key
+        self._replace_root(key, priority)
+        return result[1], result[0]
+
+    def replace_max(self, key: _KEY, priority: _PRIORITY) -> Tuple[_KEY, _PRIORITY]:
+        """Remove and return (key, priority) pair with max **priority**, then add **key** with given **priority** to PST.
+
+        Works like :func:`heapq.heapreplace`. If **key** already exists in PST its **priority** is updated.
+
+        Args:
+            key: **key** to add
+            priority: **priority** of the **key**
+
+        Returns:
+            Tuple: **key** and **priority** pair with max **priority**
+
+        Raises:
+            KeyError: If the PST is empty
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST
+        """
+        if self._root == Node.NULL_NODE:
+            raise KeyError
+        result = self._root.heap_key
+        if key == result[1]:
+            self.update_priority(key, priority)
+        elif not self._replace_root(key, priority):
+            self._remove(result[1], self._root)
+            self.update_priority(key, priority)
+        return result[1], result[0]
+
+    def nlargest(self, k: int) -> list:
+        """Returns `k` (key, priority) pairs with the largest **priority** without removing them.
+
+        Args:
+            k (int): Number of items to return
+
+        Returns:
+            List: (**key**, **priority**) pairs in descending **priority** order
+
+        Complexity:
+            `O(k*log(k))`
+        """
+        if self._root == Node.NULL_NODE or k <= 0:
+            return []
+        return [(node.heap_key[1], node.heap_key[0]) for node in islice(self._iter_by_priority(*self._key_bounds()), k)]
+
+    def pop_many(self, k: int) -> list:
+        """Remove and return `k` (key, priority) pairs with the largest **priority**.
+
+        Args:
+            k (int): Number of items to remove. All items are removed if `k` is grater than number of items in PST
+
+        Returns:
+            List: removed (**key**, **priority**) pairs in descending **priority** order
+
+        Complexity:
+            `O(k*log(N))` where **N** is number of items in PST, `O(N)` if at most a quarter of items remains
+        """
+        if (self._len - k) * _REBUILD_RATIO > self._len:
+            # every item is taken from the root, so there is no key search that removing items together could save
+            result = []
+            for _ in range(k):
+                heap_key = self._root.heap_key
+                self._remove(heap_key[1], self._root)
+                result.append((heap_key[1], heap_key[0]))
+            return result
+
+        heap_nodes = list(islice(self._iter_by_priority(*self._key_bounds()), k)) if self._len else []
+        return _to_items(self._remove_many(heap_nodes), True)
+
     def _fix_delete(self, node: Node) -> None:
         while node != self._root and node.color == 0:
             if node == node.parent.left:
@@ -242,7 +758,173 @@ class PrioritySearchTree(MutableMapping):
         else:
             u.parent.set_right(v)
 
-    def query(self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY) -> list:
+    def _key_bounds(self) -> Tuple[_KEY, _KEY]:
+        left = self._root
+        while left.left != Node.NULL_NODE:
+            left = left.left
+        right = self._root
+        while right.right != Node.NULL_NODE:
+            right = right.right
+        return left.tree_key, right.tree_key
+
+    def _iter_query(
+        self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY, node: Optional[Node] = None
+    ) -> Iterator[Tuple[_PRIORITY, _KEY]]:
+        stack = [self._root if node is None else node]
+        while stack:
+            node = stack.pop()
+            heap_key = node.heap_key
+            if heap_key[0] == Node.PLACEHOLDER_VALUE or heap_key[0] < priority_bottom:
+                continue
+
+            if key_left <= heap_key[1] <= key_right:
+                yield heap_key
+
+            if key_right < node.tree_key:
+                stack.append(node.left)
+            elif key_left >= node.tree_key:
+                stack.append(node.right)
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+
+    def _iter_by_priority(self, key_left: _KEY, key_right: _KEY) -> Iterator[Node]:
+        # Yields nodes with keys in range in descending heap key order, ancestors go before descendants.
+        if self._root.heap_key[0] == Node.PLACEHOLDER_VALUE:
+            return
+
+        frontier = [_MaxHeapItem(self._root)]
+        while frontier:
+            node = heapq.heappop(frontier).node
+            if key_left <= node.heap_key[1] <= key_right:
+                yield node
+
+            if key_right >= node.tree_key and node.right.heap_key[0] != Node.PLACEHOLDER_VALUE:
+                heapq.heappush(frontier, _MaxHeapItem(node.right))
+            if key_left < node.tree_key and node.left.heap_key[0] != Node.PLACEHOLDER_VALUE:
+                heapq.heappush(frontier, _MaxHeapItem(node.left))
+
+    def _iter_key_ordered(
+        self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY, reverse: bool
+    ) -> Iterator[Tuple[_PRIORITY, _KEY]]:
+        # Subtrees are visited in key order, each one with the bound of its keys (lower bound, or upper bound for
+        # reverse order). Found heap keys are buffered sorted by key and reported once no pending subtree can hold
+        # a key that goes before them.
+        stack = [(self._root, None)]
+        candidates = []
+        while stack:
+            node, bound = stack.pop()
+            if bound is not None:
+                if reverse:
+                    while candidates and candidates[-1][0] >= bound:
+                        yield candidates.pop()[1]
+                else:
+                    while candidates and candidates[0][0] < bound:
+                        yield candidates.pop(0)[1]
+
+            heap_key = node.heap_key
+            if heap_key[0] == Node.PLACEHOLDER_VALUE or heap_key[0] < priority_bottom:
+                continue
+
+            if key_left <= heap_key[1] <= key_right:
+                insort(candidates, (heap_key[1], heap_key))
+
+            if reverse:
+                if key_left < node.tree_key:
+                    stack.append((node.left, node.tree_key))
+                if key_right >= node.tree_key:
+                    stack.append((node.right, bound))
+            else:
+                if key_right >= node.tree_key:
+                    stack.append((node.right, node.tree_key))
+                if key_left < node.tree_key:
+                    stack.append((node.left, bound))
+
+        if reverse:
+            candidates.reverse()
+        for candidate in candidates:
+            yield candidate[1]
+
+    def _range_max_node(self, key_left: _KEY, key_right: _KEY, left_open: bool = False, right_open: bool = False) -> Optional[Node]:
+        # Walks down to the node where search paths of both bounds split and then along each path. Subtrees that hang
+        # between the paths are fully in range, so only their top heap keys are checked. A path is abandoned as soon
+        # as its heap keys are smaller than the best one found.
+        result = None
+        node = self._root
+        while node.heap_key[0] != Node.PLACEHOLDER_VALUE and (result is None or node.heap_key > result.heap_key):
+            key = node.heap_key[1]
+            if (key_left < key or (not left_open and key_left == key)) and (key < key_right or (not right_open and key == key_right)):
+                result = node
+            if key_right < node.tree_key:
+                node = node.left
+            elif key_left >= node.tree_key:
+                node = node.right
+            else:
+                break
+        else:
+            return result
+
+        split_node = node
+        node = split_node.left
+        while node.heap_key[0] != Node.PLACEHOLDER_VALUE and (result is None or node.heap_key > result.heap_key):
+            key = node.heap_key[1]
+            if key_left < key or (not left_open and key_left == key):
+                result = node
+            if key_left < node.tree_key:
+                if node.right.heap_key[0] != Node.PLACEHOLDER_VALUE and (result is None or node.right.heap_key > result.heap_key):
+                    result = node.right
+                node = node.left
+            else:
+                node = node.right
+
+        node = split_node.right
+        while node.heap_key[0] != Node.PLACEHOLDER_VALUE and (result is None or node.heap_key > result.heap_key):
+            key = node.heap_key[1]
+            if key < key_right or (not right_open and key == key_right):
+                result = node
+            if key_right >= node.tree_key:
+                if node.left.heap_key[0] != Node.PLACEHOLDER_VALUE and (result is None or node.left.heap_key > result.heap_key):
+                    result = node.left
+                node = node.right
+            else:
+                node = node.left
+
+        return result
+
+    def _extreme_key_query(
+        self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY, largest: bool
+    ) -> Optional[Tuple[_PRIORITY, _KEY]]:
+        # Depth first search in key order (reverse key order for the largest key). Each pending subtree keeps the bound
+        # of its keys and is skipped once the best found key goes before that bound.
+        result = None
+        stack = [(self._root, None)]
+        while stack:
+            node, bound = stack.pop()
+            if result is not None and bound is not None and (bound <= result[1] if largest else bound >= result[1]):
+                continue
+
+            heap_key = node.heap_key
+            if heap_key[0] == Node.PLACEHOLDER_VALUE or heap_key[0] < priority_bottom:
+                continue
+
+            if key_left <= heap_key[1] <= key_right:
+                if result is None or (heap_key[1] > result[1] if largest else heap_key[1] < result[1]):
+                    result = heap_key
+
+            if largest:
+                if key_left < node.tree_key:
+                    stack.append((node.left, node.tree_key))
+                if key_right >= node.tree_key:
+                    stack.append((node.right, bound))
+            else:
+                if key_right >= node.tree_key:
+                    stack.append((node.right, node.tree_key))
+                if key_left < node.tree_key:
+                    stack.append((node.left, bound))
+
+        return result
+
+    def query(self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY, items_limit: int = 0, with_priority: bool = False) -> list:
         """Performs 3 sided query on PST.
 
         This function returns list of items that meet the following criteria:
@@ -254,98 +936,334 @@ class PrioritySearchTree(MutableMapping):
             key_left: Left bound for query (**key** is used to compare).
             key_right: Right bound for query (**key** is used to compare).
             priority_bottom: Bottom bound for query (**priority** is used to compare).
+            items_limit (int): Number of items to return. Default value is ``0`` - no limit.
+                Traversal stops as soon as `items_limit` items are found, returned items are not sorted.
+            with_priority (bool): If ``True`` (**key**, **priority**) pairs are returned instead of **keys**.
+                Default value is ``False``
 
         Returns:
-            List: list of **keys** that satisfy criteria, or empty list if no items found
+            List: list of **keys** (or (**key**, **priority**) pairs) that satisfy criteria, or empty list if no items
+            found
 
         Complexity:
             `O(log(N)+K)` where **N** is number of items in PST and **K** is number of reported items
         """
-        result = []
+        heap_keys = self._iter_query(key_left, key_right, priority_bottom)
+        if items_limit > 0:
+            heap_keys = islice(heap_keys, items_limit)
+        return _to_items(heap_keys, with_priority)
 
-        def _query_node(node) -> None:
-            if node == Node.NULL_NODE or node.heap_key[0] == Node.PLACEHOLDER_VALUE:
-                return
+    def query_many(self, queries: Iterable[Tuple[_KEY, _KEY, _PRIORITY]]) -> list:
+        """Performs several 3 sided queries on PST at once.
 
-            if node.heap_key[0] >= priority_bottom:
-                if key_left <= node.heap_key[1] <= key_right:
-                    result.append(node.heap_key[1])
-            else:
-                return
+        Queries are answered by a single traversal of PST: every node is visited once for all queries that reach it,
+        so queries with close bounds share the work of descending from the root.
 
-            if key_right < node.tree_key:
-                _query_node(node.left)
-            elif key_left >= node.tree_key:
-                _query_node(node.right)
-            else:
-                _query_node(node.left)
-                _query_node(node.right)
+        Example::
 
-        _query_node(self._root)
-        return result
+            # two queries: keys in [0, 10] with priority >= 5 and keys in [5, 20] with priority >= 7
+            keys_a, keys_b = pst.query_many([(0, 10, 5), (5, 20, 7)])
 
-    def sorted_query(self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY, items_limit: int = 0) -> list:
-        """Performs 3 sided query on PST.
+        Args:
+            queries (Iterable): Queries to perform. Each query is a tuple of `key_left`, `key_right` and
+                `priority_bottom` arguments of :meth:`query`.
+
+        Returns:
+            List: list with result of every query (in the order of `queries`), each result is the same list of
+            **keys** that :meth:`query` returns for the query
+
+        Complexity:
+            `O(M*log(N)+K)` where **N** is number of items in PST, **M** is number of queries and **K** is total number
+            of reported items
+        """
+        results = []
+        group = []
+        for key_left, key_right, priority_bottom in queries:
+            result = []
+            results.append(result)
+            group.append((key_left, key_right, priority_bottom, result))
+
+        # Nodes are visited once for a group of queries that reach them. Small groups are cheaper to traverse query
+        # by query.
+        stack = [(self._root, group)]
+        while stack:
+            node, group = stack.pop()
+            heap_key = node.heap_key
+            if heap_key[0] == Node.PLACEHOLDER_VALUE:
+                continue
+
+            if len(group) <= 2:
+                for key_left, key_right, priority_bottom, result in group:
+                    result.extend(heap_key[1] for heap_key in self._iter_query(key_left, key_right, priority_bottom, node))
+                continue
+
+            left_group = []
+            right_group = []
+            for query in group:
+                if heap_key[0] < query[2]:
+                    continue
+                if query[0] <= heap_key[1] <= query[1]:
+                    query[3].append(heap_key[1])
+                if query[0] < node.tree_key:
+                    left_group.append(query)
+                if query[1] >= node.tree_key:
+                    right_group.append(query)
+
+            if right_group:
+                stack.append((node.right, right_group))
+            if left_group:
+                stack.append((node.left, left_group))
+
+        return results
+
+    def query_arrays(self, lefts, rights, bottoms, dtype=None) -> tuple:
+        """Performs several 3 sided queries on PST at once, bounds and results are passed as NumPy arrays.
+
+        Results are returned in CSR (compressed sparse row) format: **keys** reported by query `i` are
+        ``keys[offsets[i]:offsets[i + 1]]``.
+
+        Example::
+
+            keys, offsets = pst.query_arrays(numpy.array([0, 5]), numpy.array([10, 20]), numpy.array([5, 7]))
+
+        Args:
+            lefts (numpy.ndarray): Left bounds of the queries (**key** is used to compare).
+            rights (numpy.ndarray): Right bounds of the queries (**key** is used to compare).
+            bottoms (numpy.ndarray): Bottom bounds of the queries (**priority** is used to compare).
+            dtype (numpy.dtype): Data type of ``keys`` array. By default it is inferred from reported **keys**, or
+                taken from `lefts` and `rights` if no **keys** are reported.
+
+        Returns:
+            Tuple: ``keys`` array and ``offsets`` array of length `M+1`
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If bounds arrays have different lengths
+
+        Complexity:
+            `O(M*log(N)+K)` where **N** is number of items in PST, **M** is number of queries and **K** is total number
+            of reported items
+
+        Note:
+            NumPy is an optional dependency, it can be installed with ``pip install priority-search-tree[numpy]``
+        """
+        try:
+            import numpy  # noqa: PLC0415
+        except ImportError as e:
+            raise ImportError("NumPy is required for query_arrays, install it with: pip install priority-search-tree[numpy]") from e
+
+        lefts = numpy.asarray(lefts)
+        rights = numpy.asarray(rights)
+        bottoms = numpy.asarray(bottoms)
+        if not len(lefts) == len(rights) == len(bottoms):
+            raise ValueError("lefts, rights and bottoms must have the same length")
+
+        results = self.query_many(zip(lefts.tolist(), rights.tolist(), bottoms.tolist()))
+        offsets = numpy.zeros(len(results) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(result) for result in results], out=offsets[1:])
+        keys = list(chain.from_iterable(results))
+        if dtype is None and not keys:
+            # there are no keys to infer dtype from, bounds are compared with keys so they have the same type
+            dtype = numpy.result_type(lefts, rights)
+        return numpy.array(keys, dtype=dtype), offsets
+
+    def ordered_query(
+        self,
+        key_left: _KEY,
+        key_right: _KEY,
+        priority_bottom: _PRIORITY,
+        items_limit: int = 0,
+        after_key: Optional[_KEY] = None,
+        reverse: bool = False,
+        with_priority: bool = False,
+    ) -> list:
+        """Performs 3 sided query on PST and returns items sorted by **key**.
 
         This function returns list of items that meet the following criteria:
             1. items have **key** grater or equal to `key_left` argument
             2. items have **key** smaller or equal to `key_right` argument
             3. items have **priority** grater or equal to `priority_bottom` argument
 
+        Results can be paginated: pass the last **key** of the previous page as `after_key` to get the next page.
+
+        Example::
+
+            page = pst.ordered_query(0, 100, 5, items_limit=10)
+            while page:
+                ...
+                page = pst.ordered_query(0, 100, 5, items_limit=10, after_key=page[-1])
+
         Args:
             key_left: Left bound for query (**key** is used to compare).
             key_right: Right bound for query (**key** is used to compare).
             priority_bottom: Bottom bound for query (**priority** is used to compare).
             items_limit (int): Number of items to return. Default value is ``0`` - no limit.
+            after_key: Only items with **key** grater than `after_key` (smaller than `after_key` in case of reverse
+                order) are returned. Default value is ``None`` - no restriction.
+            reverse (bool): If ``True`` items are sorted by **key** in descending order. Default value is ``False``
+            with_priority (bool): If ``True`` (**key**, **priority**) pairs are returned instead of **keys**.
+                Default value is ``False``
 
         Returns:
-            List: list of items that satisfy criteria and sorted by **priority**
-            (in case of limit, items with largest **priority** will be returned), or empty list if no items found
+            List: list of **keys** (or (**key**, **priority**) pairs) that satisfy criteria sorted by **key**, or empty
+            list if no items found
 
         Complexity:
-            `O(log(N)+K*log(K))` where **N** is number of items in PST and **K** is number of returned items
+            `O(log(N)+K)` where **N** is number of items in PST and **K** is number of returned items
         """
-        if items_limit <= 0:
-            items_limit = self._len
+        if after_key is not None:
+            if reverse:
+                if after_key <= key_right:
+                    key_right = after_key
+            elif key_left <= after_key:
+                key_left = after_key
+
+        heap_keys = self._iter_key_ordered(key_left, key_right, priority_bottom, reverse)
+        if after_key is not None:
+            heap_keys = (heap_key for heap_key in heap_keys if heap_key[1] != after_key)
+        if items_limit > 0:
+            heap_keys = islice(heap_keys, items_limit)
+        return _to_items(heap_keys, with_priority)
+
+    def iquery(self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY, with_priority: bool = False) -> Iterator:
+        """Performs lazy 3 sided query on PST.
+
+        This function returns iterator over items that meet the following criteria:
+            1. items have **key** grater or equal to `key_left` argument
+            2. items have **key** smaller or equal to `key_right` argument
+            3. items have **priority** grater or equal to `priority_bottom` argument
 
-        def _sorted_query_node(node, limit) -> list:
-            result = []
-            if node == Node.NULL_NODE or node.heap_key[0] == Node.PLACEHOLDER_VALUE or limit == 0:
-                return result
+        Items are reported in the same order as :meth:`query` reports them, traversal is suspended between items
+        and stops as soon as iteration is stopped.
 
-            if node.heap_key[0] >= priority_bottom:
-                if key_left <= node.heap_key[1] <= key_right:
-                    result.append(node.heap_key)
-                    limit -= 1
-            else:
-                return result
+        Args:
+            key_left: Left bound for query (**key** is used to compare).
+            key_right: Right bound for query (**key** is used to compare).
+            priority_bottom: Bottom bound for query (**priority** is used to compare).
+            with_priority (bool): If ``True`` (**key**, **priority**) pairs are returned instead of **keys**.
+                Default value is ``False``
 
-            if key_right < node.tree_key:
-                result.extend(_sorted_query_node(node.left, limit))
-            elif key_left >= node.tree_key:
-                result.extend(_sorted_query_node(node.right, limit))
-            else:
-                left = _sorted_query_node(node.left, limit)
-                right = _sorted_query_node(node.right, limit)
-                # merge
-                i, j = 0, 0
-                while i < len(left) and j < len(right) and len(result) < items_limit:
-                    if left[i] >= right[j]:
-                        result.append(left[i])
-                        i += 1
-                    else:
-                        result.append(right[j])
-                        j += 1
-                while i < len(left) and len(result) < items_limit:
-                    result.append(left[i])
-                    i += 1
-                while j < len(right) and len(result) < items_limit:
-                    result.append(right[j])
-                    j += 1
+        Returns:
+            Iterator: iterator over **keys** (or (**key**, **priority**) pairs) that satisfy criteria
 
-            return result
+        Complexity:
+            `O(log(N)+K)` where **N** is number of items in PST and **K** is number of reported items.
+            Memory usage is `O(log(N))`
+
+        Note:
+            PST must not be modified while iterating
+        """
+        for heap_key in self._iter_query(key_left, key_right, priority_bottom):
+            yield (heap_key[1], heap_key[0]) if with_priority else heap_key[1]
+
+    def iter_by_priority(self, key_left: Optional[_KEY] = None, key_right: Optional[_KEY] = None) -> Iterator[Tuple[_KEY, _PRIORITY]]:
+        """Lazily iterates over items in descending **priority** order without modifying PST.
+
+        Args:
+            key_left: Left bound of the range (**key** is used to compare). Default value is ``None`` - no bound.
+            key_right: Right bound of the range (**key** is used to compare). Default value is ``None`` - no bound.
+
+        Returns:
+            Iterator: iterator over (**key**, **priority**) pairs with **key** in range [`key_left`, `key_right`]
+
+        Complexity:
+            `O(log(N)+K*log(K))` where **N** is number of items in PST and **K** is number of reported items
 
-        return [x[1] for x in _sorted_query_node(self._root, items_limit)]
+        Note:
+            PST must not be modified while iterating
+        """
+        if self._root == Node.NULL_NODE:
+            return
+        if key_left is None or key_right is None:
+            min_key, max_key = self._key_bounds()
+            key_left = min_key if key_left is None else key_left
+            key_right = max_key if key_right is None else key_right
+        for node in self._iter_by_priority(key_left, key_right):
+            yield node.heap_key[1], node.heap_key[0]
+
+    def count_query(self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY) -> int:
+        """Counts items that satisfy 3 sided query criteria.
+
+        This function returns number of items that meet the following criteria:
+            1. items have **key** grater or equal to `key_left` argument
+            2. items have **key** smaller or equal to `key_right` argument
+            3. items have **priority** grater or equal to `priority_bottom` argument
+
+        Args:
+            key_left: Left bound for query (**key** is used to compare).
+            key_right: Right bound for query (**key** is used to compare).
+            priority_bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            int: number of items that satisfy criteria
+
+        Complexity:
+            `O(log(N)+K)` where **N** is number of items in PST and **K** is number of counted items
+        """
+        return sum(1 for _ in self._iter_query(key_left, key_right, priority_bottom))
+
+    def any_query(self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY) -> bool:
+        """Checks if there is any item that satisfy 3 sided query criteria.
+
+        This function checks if PST contains item that meet the following criteria:
+            1. item has **key** grater or equal to `key_left` argument
+            2. item has **key** smaller or equal to `key_right` argument
+            3. item has **priority** grater or equal to `priority_bottom` argument
+
+        Args:
+            key_left: Left bound for query (**key** is used to compare).
+            key_right: Right bound for query (**key** is used to compare).
+            priority_bottom: Bottom bound for query (**priority** is used to compare).
+
+        Returns:
+            bool: ``True`` if at least one item satisfy criteria, ``False`` otherwise.
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST
+        """
+        for _ in self._iter_query(key_left, key_right, priority_bottom):
+            return True
+        return False
+
+    def sorted_query(
+        self, key_left: _KEY, key_right: _KEY, priority_bottom: _PRIORITY, items_limit: int = 0, with_priority: bool = False
+    ) -> list:
+        """Performs 3 sided query on PST.
+
+        This function returns list of items that meet the following criteria:
+            1. items have **key** grater or equal to `key_left` argument
+            2. items have **key** smaller or equal to `key_right` argument
+            3. items have **priority** grater or equal to `priority_bottom` argument
+
+        Args:
+            key_left: Left bound for query (**key** is used to compare).
+            key_right: Right bound for query (**key** is used to compare).
+            priority_bottom: Bottom bound for query (**priority** is used to compare).
+            items_limit (int): Number of items to return. Default value is ``0`` - no limit.
+            with_priority (bool): If ``True`` (**key**, **priority**) pairs are returned instead of **keys**.
+                Default value is ``False``
+
+        Returns:
+            List: list of items that satisfy criteria and sorted by **priority**
+            (in case of limit, items with largest **priority** will be returned), or empty list if no items found
+
+        Complexity:
+            `O(log(N)+K*log(K))` where **N** is number of items in PST and **K** is number of returned items.
+            With a limit, items are found by best-first search that stops after `items_limit` items, so **K** does not
+            depend on the number of items that satisfy criteria.
+        """
+        if items_limit > 0:
+            heap_keys = []
+            for node in islice(self._iter_by_priority(key_left, key_right), items_limit):
+                heap_key = node.heap_key
+                if heap_key[0] < priority_bottom:
+                    break
+                heap_keys.append(heap_key)
+        else:
+            heap_keys = list(self._iter_query(key_left, key_right, priority_bottom))
+            heap_keys.sort(reverse=True)
+
+        return _to_items(heap_keys, with_priority)
 
     def _fix_insert(self, node: Node) -> None:
         while node.parent.color == 1:
@@ -432,16 +1350,20 @@ class PrioritySearchTree(MutableMapping):
         """Removes **all** items from PST.
 
         Complexity:
-            `O(1)`
+            `O(1)`, `O(N)` if PST is indexed
         """
         self._root = Node.NULL_NODE
         self._len = 0
+        if self._index is not None:
+            for handle in self._index.values():
+                handle.node = None
+            self._index = {}
 
-    def update_priority(self, key: _KEY, priority: _PRIORITY) -> _PRIORITY:
+    def update_priority(self, key: Union[_KEY, ItemHandle], priority: _PRIORITY) -> _PRIORITY:
         """Updates priority for the given key.
 
         Args:
-            key: **key** to update
+            key: **key** to update or :class:`ItemHandle` of the item returned by :meth:`insert`
             priority: new **priority** value
 
         Returns:
@@ -454,25 +1376,36 @@ class PrioritySearchTree(MutableMapping):
             `O(log(N))` where **N** is number of items in PST
 
         """
-        node = self._root
-        heap_node = None
-        while node.heap_key[0] != Node.PLACEHOLDER_VALUE:
-
-            if key == node.heap_key[1]:
-                heap_node = node
-                break
-
-            if key < node.tree_key:
-                node = node.left
-            else:
-                node = node.right
+        if isinstance(key, ItemHandle):
+            heap_node = key.node
+            key = key.key
+        else:
+            heap_node = self._find_heap_node(key)
 
         if not heap_node:
             raise KeyError(f"Key not found:{key}")
 
         result = heap_node.heap_key[0]
-        self._push_up(heap_node)
-        self._sift_down(self._root, (priority, key))
+        heap_key = (priority, key)
+        if heap_key > heap_node.heap_key:
+            # increase: new entry moves to the topmost ancestor with smaller entry
+            node = heap_node
+            while node.parent and node.parent.heap_key < heap_key:
+                node = node.parent
+            if node == heap_node:
+                heap_node.heap_key = heap_key
+            else:
+                self._push_up(heap_node)
+                self._push_down(node, heap_key)
+        else:
+            # decrease: new entry stays in the subtree of the heap node
+            left = heap_node.left.heap_key
+            right = heap_node.right.heap_key
+            if (left[0] == Node.PLACEHOLDER_VALUE or left < heap_key) and (right[0] == Node.PLACEHOLDER_VALUE or right < heap_key):
+                heap_node.heap_key = heap_key
+            else:
+                self._push_up(heap_node)
+                self._sift_down(heap_node, heap_key)
         return result
 
     def __setitem__(self, key: _KEY, priority: _PRIORITY) -> None:
@@ -489,8 +1422,23 @@ class PrioritySearchTree(MutableMapping):
         if self._root == Node.NULL_NODE:
             self._root = Node(tree_key=key, heap_key=(priority, key), color=0)
             self._len = 1
+            if self._index is not None:
+                self._index[key] = ItemHandle(key, self._root)
+            return
+
+        new_placeholder = self._add_leaf(key)
+        if new_placeholder is None:
+            self.update_priority(key, priority)
             return
 
+        if self._index is not None:
+            self._index[key] = ItemHandle(key, None)
+        self._sift_down(self._root, (priority, key))
+        self._fix_insert(new_placeholder)
+        self._len += 1
+
+    def _add_leaf(self, key: _KEY) -> Optional[Node]:
+        # Adds empty leaf for the new key to not empty tree, returns None if the key is already in the tree.
         prev = None
         node = self._root
         while node != Node.NULL_NODE:
@@ -498,8 +1446,7 @@ class PrioritySearchTree(MutableMapping):
             if key < node.tree_key:
                 node = node.left
             elif key == node.tree_key:
-                self.update_priority(key, priority)
-                return
+                return None
             else:
                 node = node.right
 
@@ -513,16 +1460,84 @@ class PrioritySearchTree(MutableMapping):
             prev.tree_key = key
             prev.set_right(new_placeholder)
             prev.set_left(prev_placeholder)
+        return new_placeholder
+
+    def _replace_root(self, key: _KEY, priority: _PRIORITY) -> bool:
+        # Replaces the max item with the new key in one heap pass, returns False if the key is already in the tree.
+        removed_key = self._root.heap_key[1]
+        new_placeholder = self._add_leaf(key)
+        if new_placeholder is None:
+            return False
+
+        placeholder = Node.PLACEHOLDER_VALUE
+        index = self._index
+        if index is not None:
+            index[key] = ItemHandle(key, None)
+            index.pop(removed_key).node = None
+
+        # root entry is vacated, the hole goes down the path of the new key until the new entry fits into it
+        heap_key = (priority, key)
+        node = self._root
+        while True:
+            left = node.left
+            right = node.right
+            if left.heap_key[0] == placeholder:
+                child = right
+            elif right.heap_key[0] != placeholder and right.heap_key > left.heap_key:
+                child = right
+            else:
+                child = left
+            if child.heap_key[0] == placeholder or heap_key > child.heap_key:
+                node.heap_key = heap_key
+                if index is not None:
+                    index[key].node = node
+                break
+
+            node.heap_key = child.heap_key
+            if index is not None:
+                index[child.heap_key[1]].node = node
+            on_path = left if key < node.tree_key else right
+            if child != on_path:
+                # paths split, the hole and the new entry are handled in different subtrees
+                self._push_up(child)
+                self._sift_down(on_path, heap_key)
+                break
+            node = child
 
-        self._sift_down(self._root, (priority, key))
         self._fix_insert(new_placeholder)
         self._len += 1
+        self._cut_leaf(self._find_leaf(removed_key, self._root))
+        return True
+
+    def insert(self, key: _KEY, priority: _PRIORITY) -> ItemHandle:
+        """Adds **key** with given **priority** to PST or updates **priority** of existing **key**.
+
+        Returned handle can be passed to :meth:`update_priority` and ``del`` instead of the **key**
+        to skip the **key** search. Handles are stored in key index, so PST must be created with ``indexed=True``.
 
-    def __delitem__(self, key: _KEY) -> None:
+        Args:
+            key: **key** to add/update
+            priority: new **priority**
+
+        Returns:
+            ItemHandle: handle of the item
+
+        Raises:
+            ValueError: in case if PST was created without key index
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST
+        """
+        if self._index is None:
+            raise ValueError("Item handles require PST created with indexed=True")
+        self[key] = priority
+        return self._index[key]
+
+    def __delitem__(self, key: Union[_KEY, ItemHandle]) -> None:
         """Remove **key** from PST.
 
         Args:
-            key: **key** to remove
+            key: **key** to remove or :class:`ItemHandle` of the item returned by :meth:`insert`
 
         Raises:
             KeyError: in case if **key** not exists in PST
@@ -530,39 +1545,61 @@ class PrioritySearchTree(MutableMapping):
         Complexity:
             `O(log(N))` where **N** is number of items in PST
         """
-        tree_node = None
-        node = self._root
-        while node != Node.NULL_NODE:
-            if key == node.tree_key:
-                tree_node = node
-                break
-            elif key < node.tree_key:
-                node = node.left
-            else:
-                node = node.right
-
-        if tree_node is None:
-            raise KeyError(f"Key not found:{key}")
+        if isinstance(key, ItemHandle):
+            if key.node is None:
+                raise KeyError(f"Key not found:{key.key}")
+            self._remove(key.key, key.node)
+        else:
+            self._remove(key)
+
+    def _remove(self, key: _KEY, heap_node: Optional[Node] = None) -> None:
+        if heap_node is None and self._index is not None:
+            handle = self._index.get(key)
+            if handle is None:
+                raise KeyError(f"Key not found:{key}")
+            heap_node = handle.node
+
+        if heap_node is None:
+            if self._root == Node.NULL_NODE:
+                raise KeyError(f"Key not found:{key}")
+            leaf_node = self._find_leaf(key, self._root)
+            if leaf_node.tree_key != key:
+                raise KeyError(f"Key not found:{key}")
+            heap_node = leaf_node
+            while heap_node.heap_key[1] != key:
+                heap_node = heap_node.parent
+        else:
+            leaf_node = self._find_leaf(key, heap_node)
 
-        leaf_node = None
-        node = tree_node
-        while node != Node.NULL_NODE:
-            leaf_node = node
+        self._push_up(heap_node)
+        if self._index is not None:
+            self._index.pop(key).node = None
+        self._cut_leaf(leaf_node)
+
+    @staticmethod
+    def _find_leaf(key: _KEY, node: Node) -> Node:
+        # Leaf of the key is below every node on the search path of the key.
+        null_node = Node.NULL_NODE
+        while node.left != null_node:
             if key < node.tree_key:
                 node = node.left
             else:
                 node = node.right
+        return node
 
+    def _cut_leaf(self, leaf_node: Node) -> None:
+        # Removes the leaf together with one internal node, heap entry of the leaf key must be already removed.
         if leaf_node == self._root:
-            self._root = Node.NULL_NODE
-            self._len = 0
+            self.clear()
             return
 
-        # remove heap value
+        # tree node is where the path to the leaf turns right last time
         node = leaf_node
-        while node.heap_key[1] != key:
-            node = node.parent
-        self._push_up(node)
+        parent = node.parent
+        while parent and parent.left == node:
+            node = parent
+            parent = node.parent
+        tree_node = parent if parent else leaf_node
 
         if tree_node.left == Node.NULL_NODE:  # left node
             cut_node = tree_node.parent
@@ -596,23 +1633,42 @@ class PrioritySearchTree(MutableMapping):
             KeyError: in case if **key** not exists in PST
 
         Complexity:
-            `O(log(N))` where **N** is number of items in PST
+            `O(log(N))` where **N** is number of items in PST, `O(1)` if PST is indexed
         """
+        heap_node = self._find_heap_node(key)
+        if not heap_node:
+            raise KeyError(f"Key not found:{key}")
+
+        return heap_node.heap_key[0]
+
+    def _find_heap_node(self, key: _KEY) -> Optional[Node]:
+        if self._index is not None:
+            handle = self._index.get(key)
+            return None if handle is None else handle.node
+
         node = self._root
-        heap_node = None
         while node.heap_key[0] != Node.PLACEHOLDER_VALUE:
             if key == node.heap_key[1]:
-                heap_node = node
-                break
+                return node
             if key < node.tree_key:
                 node = node.left
             else:
                 node = node.right
+        return None
 
-        if not heap_node:
-            raise KeyError(f"Key not found:{key}")
+    def __contains__(self, key: object) -> bool:
+        """Implements membership test operator.
 
-        return heap_node.heap_key[0]
+        Args:
+            key: **key** to find
+
+        Returns:
+            bool: ``True`` if **key** exists in PST
+
+        Complexity:
+            `O(log(N))` where **N** is number of items in PST, `O(1)` if PST is indexed
+        """
+        return self._find_heap_node(key) is not None
 
     def __iter__(self) -> Iterator:
         """Create an iterator that iterates **keys** in sorted order
@@ -0,0 +1,60 @@
+import gc
+import random
+import sys
+from time import perf_counter_ns
+
+import numpy
+
+from priority_search_tree import PrioritySearchTree
+
+NUMBER_OF_ITEMS = 10**6
+NUMBER_OF_QUERIES = 10**5
+QUERY_WIDTHS = [100, 10000]
+
+
+def setup(num_of_items, num_of_queries, width):
+    priorities = list(range(num_of_items))
+    random.shuffle(priorities)
+    pst = PrioritySearchTree(enumerate(priorities))
+    lefts = numpy.sort(numpy.random.randint(0, num_of_items, size=num_of_queries))
+    rights = lefts + width
+    bottoms = numpy.random.randint(num_of_items - num_of_items // 100, num_of_items, size=num_of_queries)
+    return pst, lefts, rights, bottoms
+
+
+def loop_query(pst, lefts, rights, bottoms):
+    return [pst.query(*x) for x in zip(lefts.tolist(), rights.tolist(), bottoms.tolist())]
+
+
+def array_query(pst, lefts, rights, bottoms):
+    return pst.query_arrays(lefts, rights, bottoms)
+
+
+QUERIES = {"loop of query": loop_query, "query_arrays": array_query}
+
+
+def perf_test(num_of_items, num_of_queries, width):
+    pst, lefts, rights, bottoms = setup(num_of_items, num_of_queries, width)
+    print(f"{width:>9}", end="|")
+    gc.disable()
+    for exec_fun in QUERIES.values():
+        st = perf_counter_ns()
+        exec_fun(pst, lefts, rights, bottoms)
+        elapsed = perf_counter_ns() - st
+        print(f"{elapsed // 1000000:>19}", end="|")
+    gc.enable()
+    print()
+
+
+if __name__ == "__main__":
+    num_of_items = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_ITEMS
+    width = 10 + 20 * len(QUERIES)
+    print(f"{f' {NUMBER_OF_QUERIES} queries (milliseconds), {num_of_items} items. ':=^{width}}")
+    print(f"{'width':^9}", end="|")
+    for name in QUERIES:
+        print(f"{name:^19}", end="|")
+    print()
+    print(f"{'':-^{width}}")
+    for query_width in QUERY_WIDTHS:
+        perf_test(num_of_items, NUMBER_OF_QUERIES, query_width)
+    print(f"{'':-^{width}}")
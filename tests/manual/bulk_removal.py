@@ -0,0 +1,67 @@
+import gc
+import random
+import sys
+from time import perf_counter_ns
+
+from priority_search_tree import PrioritySearchTree
+
+NUMBER_OF_ITEMS = 200000
+RESULT_SIZES = [100, 2000, 20000, 60000, 100000, 150000]
+REPEATS = 3
+
+
+def setup(num_of_items):
+    priorities = list(range(num_of_items))
+    random.shuffle(priorities)
+    return PrioritySearchTree(enumerate(priorities))
+
+
+def del_loop(pst, result_size):
+    for key in pst.query(0, len(pst), len(pst) - result_size):
+        del pst[key]
+
+
+def pop_query(pst, result_size):
+    pst.pop_query(0, len(pst), len(pst) - result_size)
+
+
+def scan_del_loop(pst, result_size):
+    for key in [key for key, priority in pst.items() if priority < result_size]:
+        del pst[key]
+
+
+def prune(pst, result_size):
+    pst.prune(0, len(pst), result_size)
+
+
+OPERATIONS = {"query + del loop": del_loop, "pop_query": pop_query, "scan + del loop": scan_del_loop, "prune": prune}
+
+
+def perf_test(num_of_items, result_size):
+    print(f"{result_size:>9}", end="|")
+    for operation in OPERATIONS.values():
+        elapsed = []
+        for _ in range(REPEATS):
+            pst = setup(num_of_items)
+            gc.disable()
+            st = perf_counter_ns()
+            operation(pst, result_size)
+            elapsed.append(perf_counter_ns() - st)
+            gc.enable()
+        print(f"{min(elapsed) // 1000000:>19}", end="|")
+    print()
+
+
+if __name__ == "__main__":
+    num_of_items = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_ITEMS
+    width = 10 + 20 * len(OPERATIONS)
+    print(f"{f' Removing K items (milliseconds, best of {REPEATS}), {num_of_items} items. ':=^{width}}")
+    print(f"{'K':^9}", end="|")
+    for name in OPERATIONS:
+        print(f"{name:^19}", end="|")
+    print()
+    print(f"{'':-^{width}}")
+    for result_size in RESULT_SIZES:
+        if result_size <= num_of_items:
+            perf_test(num_of_items, result_size)
+    print(f"{'':-^{width}}")
@@ -0,0 +1,54 @@
+import gc
+import random
+import sys
+from time import perf_counter_ns
+
+from priority_search_tree import PrioritySearchTree
+
+NUMBER_OF_ITEMS = [10**4, 10**5, 10**6]
+
+
+def setup(num_of_items):
+    priorities = list(range(num_of_items))
+    random.shuffle(priorities)
+    return PrioritySearchTree(enumerate(priorities))
+
+
+def popitem(pst):
+    while pst:
+        pst.popitem()
+
+
+def drain(pst):
+    for _ in pst.drain():
+        pass
+
+
+OPERATIONS = {"popitem": popitem, "drain": drain}
+
+
+def perf_test(num_of_items):
+    print(f"{num_of_items:>9}", end="|")
+    for operation in OPERATIONS.values():
+        pst = setup(num_of_items)
+        gc.disable()
+        st = perf_counter_ns()
+        operation(pst)
+        elapsed = perf_counter_ns() - st
+        gc.enable()
+        print(f"{elapsed // 1000000:>19}", end="|")
+    print()
+
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in sys.argv[1:]] or NUMBER_OF_ITEMS
+    width = 10 + 20 * len(OPERATIONS)
+    print(f"{' Emptying PST in priority order (milliseconds). ':=^{width}}")
+    print(f"{'':^9}", end="|")
+    for operation in OPERATIONS:
+        print(f"{operation:^19}", end="|")
+    print()
+    print(f"{'':-^{width}}")
+    for size in sizes:
+        perf_test(size)
+    print(f"{'':-^{width}}")
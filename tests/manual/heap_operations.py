@@ -0,0 +1,86 @@
+import gc
+import random
+import sys
+from time import perf_counter_ns
+
+from priority_search_tree import PrioritySearchTree
+
+NUMBER_OF_ITEMS = [10**4, 10**5, 10**6]
+NUMBER_OF_OPERATIONS = 10000
+
+
+def setup(num_of_items):
+    priorities = list(range(num_of_items))
+    random.shuffle(priorities)
+    return PrioritySearchTree((x[0] * 2, x[1]) for x in enumerate(priorities))
+
+
+def new_items(num_of_items):
+    return [(random.randrange(num_of_items) * 2 + 1, random.randrange(num_of_items * 2)) for _ in range(NUMBER_OF_OPERATIONS)]
+
+
+def composed_pushpop(pst, items):
+    for key, priority in items:
+        pst[key] = priority
+        pst.popitem()
+
+
+def native_pushpop(pst, items):
+    for key, priority in items:
+        pst.pushpop(key, priority)
+
+
+def composed_replace(pst, items):
+    for key, priority in items:
+        pst.popitem()
+        pst[key] = priority
+
+
+def native_replace(pst, items):
+    for key, priority in items:
+        pst.replace_max(key, priority)
+
+
+def composed_pop_many(pst, items):
+    for _ in items:
+        pst.popitem()
+
+
+def native_pop_many(pst, items):
+    pst.pop_many(len(items))
+
+
+OPERATIONS = {
+    "pushpop": (composed_pushpop, native_pushpop),
+    "replace_max": (composed_replace, native_replace),
+    "pop_many": (composed_pop_many, native_pop_many),
+}
+
+
+def perf_test(num_of_items):
+    print(f"{num_of_items:>9}", end="|")
+    items = new_items(num_of_items)
+    for operations in OPERATIONS.values():
+        for operation in operations:
+            pst = setup(num_of_items)
+            gc.disable()
+            st = perf_counter_ns()
+            operation(pst, items)
+            elapsed = perf_counter_ns() - st
+            gc.enable()
+            print(f"{elapsed // len(items):>9}", end="|")
+    print()
+
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in sys.argv[1:]] or NUMBER_OF_ITEMS
+    width = 10 + 20 * len(OPERATIONS)
+    print(f"{f' Nanoseconds per item, {NUMBER_OF_OPERATIONS} operations (composed / native). ':=^{width}}")
+    print(f"{'':^9}", end="|")
+    for name in OPERATIONS:
+        print(f"{name:^19}", end="|")
+    print()
+    print(f"{'':-^{width}}")
+    for size in sizes:
+        perf_test(size)
+    print(f"{'':-^{width}}")
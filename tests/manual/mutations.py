@@ -0,0 +1,63 @@
+import gc
+import random
+import sys
+from time import perf_counter_ns
+
+from priority_search_tree import PrioritySearchTree
+
+NUMBER_OF_ITEMS = [10**4, 10**6, 10**7]
+NUMBER_OF_OPERATIONS = 10000
+
+
+def setup(num_of_items, num_of_operations):
+    priorities = list(range(num_of_items))
+    random.shuffle(priorities)
+    pst = PrioritySearchTree((x[0] * 2, x[1]) for x in enumerate(priorities))
+    new_items = [(random.randrange(num_of_items) * 2 + 1, random.randrange(num_of_items)) for _ in range(num_of_operations)]
+    existing_items = [(x * 2, random.randrange(num_of_items)) for x in random.sample(range(num_of_items), k=num_of_operations)]
+    return pst, dict(new_items), existing_items
+
+
+def insert(pst, new_items, existing_items):
+    for key, priority in new_items.items():
+        pst[key] = priority
+
+
+def update(pst, new_items, existing_items):
+    for key, priority in existing_items:
+        pst.update_priority(key, priority)
+
+
+def delete(pst, new_items, existing_items):
+    for key, _ in existing_items:
+        del pst[key]
+
+
+OPERATIONS = {"Insert": insert, "Update": update, "Delete": delete}
+
+
+def perf_test(num_of_items):
+    pst, new_items, existing_items = setup(num_of_items, NUMBER_OF_OPERATIONS)
+    print(f"{num_of_items:>9}", end="|")
+    gc.disable()
+    for name, operation in OPERATIONS.items():
+        count = len(new_items) if name == "Insert" else len(existing_items)
+        st = perf_counter_ns()
+        operation(pst, new_items, existing_items)
+        elapsed = perf_counter_ns() - st
+        print(f"{count * 10**9 // elapsed:>19}", end="|")
+    gc.enable()
+    print()
+
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in sys.argv[1:]] or NUMBER_OF_ITEMS
+    print(f"{' Mutations throughput (operations per second). ':=^70}")
+    print(f"{'':^9}", end="|")
+    for operation in OPERATIONS:
+        print(f"{operation:^19}", end="|")
+    print()
+    print(f"{'':-^70}")
+    for size in sizes:
+        perf_test(size)
+    print(f"{'':-^70}")
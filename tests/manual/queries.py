@@ -0,0 +1,60 @@
+import gc
+import random
+import sys
+from time import perf_counter_ns
+
+from priority_search_tree import PrioritySearchTree
+
+NUMBER_OF_ITEMS = 10**6
+RESULT_SIZES = [10, 100, 1000, 10000, 100000]
+REPEAT_COUNT = 10
+
+
+def setup(num_of_items):
+    priorities = list(range(num_of_items))
+    random.shuffle(priorities)
+    return PrioritySearchTree(enumerate(priorities))
+
+
+def query(pst, result_size):
+    pst.query(0, len(pst), len(pst) - result_size)
+
+
+def sorted_query(pst, result_size):
+    pst.sorted_query(0, len(pst), len(pst) - result_size)
+
+
+def top20_query(pst, result_size):
+    pst.sorted_query(0, len(pst), len(pst) - result_size, items_limit=20)
+
+
+QUERIES = {"query": query, "sorted_query": sorted_query, "sorted_query top 20": top20_query}
+
+
+def perf_test(pst, result_size):
+    print(f"{result_size:>9}", end="|")
+    gc.disable()
+    for exec_fun in QUERIES.values():
+        st = perf_counter_ns()
+        for _ in range(REPEAT_COUNT):
+            exec_fun(pst, result_size)
+        elapsed = perf_counter_ns() - st
+        print(f"{elapsed // REPEAT_COUNT // 1000:>19}", end="|")
+    gc.enable()
+    print()
+
+
+if __name__ == "__main__":
+    num_of_items = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_ITEMS
+    pst = setup(num_of_items)
+    width = 10 + 20 * len(QUERIES)
+    print(f"{f' Query latency (microseconds), {num_of_items} items. ':=^{width}}")
+    print(f"{'K':^9}", end="|")
+    for name in QUERIES:
+        print(f"{name:^19}", end="|")
+    print()
+    print(f"{'':-^{width}}")
+    for result_size in RESULT_SIZES:
+        if result_size <= num_of_items:
+            perf_test(pst, result_size)
+    print(f"{'':-^{width}}")
@@ -57,6 +57,12 @@ def stress_test():
         assert len(query_result) == len(query_expected)
         assert set(query_result) == set(query_expected)
         assert pst.sorted_query(x_min, x_max, heap_key_func(items[y_min])) == query_expected
+        assert pst.ordered_query(x_min, x_max, heap_key_func(items[y_min])) == sorted(query_expected)
+        if query_expected:
+            assert pst.min_key_query(x_min, x_max, heap_key_func(items[y_min])) == min(query_expected)
+            assert pst.max_key_query(x_min, x_max, heap_key_func(items[y_min])) == max(query_expected)
+        in_range = [x for x in items if x_min <= x <= x_max]
+        assert pst.max_in_range(x_min, x_max) == max(in_range, key=lambda x: (heap_key_func(items[x]), x))
 
         for item in query_result:
             assert item in pst
@@ -71,6 +77,20 @@ def stress_test():
             items.pop(k)
             assert_rb_tree(pst._root)
 
+        if any(x_min <= x <= x_max for x in items):
+            k, p = pst.pop_max_in_range(x_min, x_max)
+            assert p == heap_key_func(items.pop(k))
+            assert_rb_tree(pst._root)
+
+        if items:
+            bottom = heap_key_func(random.choice(list(items.values())))
+            expected = {x for x, item in items.items() if x_min <= x <= x_max and heap_key_func(item) >= bottom}
+            assert {k for k, _ in pst.pop_query(x_min, x_max, bottom)} == expected
+            for k in expected:
+                items.pop(k)
+            assert len(pst) == len(items)
+            assert_rb_tree(pst._root)
+
         print(f"iter {cycle} processed. items {len(items)} in tree")
 
 
@@ -0,0 +1,67 @@
+import gc
+import random
+import sys
+from time import perf_counter_ns
+
+from priority_search_tree import PrioritySearchTree
+
+NUMBER_OF_ITEMS = [10**4, 10**5, 10**6]
+NUMBER_OF_OPERATIONS = 10000
+
+
+def setup(num_of_items, num_of_operations):
+    priorities = list(range(num_of_items))
+    random.shuffle(priorities)
+    pst = PrioritySearchTree(enumerate(priorities))
+    keys = random.sample(range(num_of_items), k=num_of_operations)
+    return pst, priorities, keys
+
+
+def dijkstra(priorities, keys):
+    # priority is negative distance, edge relaxation moves the item closer to the top
+    return [(key, priorities[key] + random.randrange(len(priorities) // 2)) for key in keys]
+
+
+def aging(priorities, keys):
+    # waiting items get a small priority boost
+    return [(key, priorities[key] + 1) for key in keys]
+
+
+def decay(priorities, keys):
+    return [(key, priorities[key] - 1) for key in keys]
+
+
+def random_update(priorities, keys):
+    return [(key, random.randrange(len(priorities))) for key in keys]
+
+
+WORKLOADS = {"Dijkstra": dijkstra, "Aging": aging, "Decay": decay, "Random": random_update}
+
+
+def perf_test(num_of_items):
+    print(f"{num_of_items:>9}", end="|")
+    for workload in WORKLOADS.values():
+        pst, priorities, keys = setup(num_of_items, NUMBER_OF_OPERATIONS)
+        updates = workload(priorities, keys)
+        gc.disable()
+        st = perf_counter_ns()
+        for key, priority in updates:
+            pst.update_priority(key, priority)
+        elapsed = perf_counter_ns() - st
+        gc.enable()
+        print(f"{len(updates) * 10**9 // elapsed:>19}", end="|")
+    print()
+
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in sys.argv[1:]] or NUMBER_OF_ITEMS
+    width = 10 + 20 * len(WORKLOADS)
+    print(f"{' update_priority throughput (operations per second). ':=^{width}}")
+    print(f"{'':^9}", end="|")
+    for workload in WORKLOADS:
+        print(f"{workload:^19}", end="|")
+    print()
+    print(f"{'':-^{width}}")
+    for size in sizes:
+        perf_test(size)
+    print(f"{'':-^{width}}")
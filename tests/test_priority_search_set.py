@@ -17,9 +17,53 @@ def test_priority_search_set():
 
     assert pss.query(Point(1, 1), Point(2, 2), Point(2, 2)) == [items[1]]
     assert pss.query(Point(1, 1), Point(5, 1), Point(1, 6)) == [items[4]]
+    assert list(pss.iquery(Point(1, 1), Point(5, 1), Point(1, 6))) == [items[4]]
+    assert pss.count_query(Point(1, 1), Point(6, 1), Point(1, 3)) == 4
+    assert len(pss.query(Point(1, 1), Point(6, 1), Point(1, 3), items_limit=2)) == 2
+    assert pss.ordered_query(Point(1, 1), Point(6, 1), Point(1, 3)) == items[2:]
+    assert pss.ordered_query(Point(1, 1), Point(6, 1), Point(1, 3), items_limit=2, after=items[2]) == items[3:5]
+    assert pss.ordered_query(Point(1, 1), Point(6, 1), Point(1, 3), items_limit=2, reverse=True) == [items[5], items[4]]
+    assert pss.any_query(Point(1, 1), Point(2, 1), Point(1, 2))
+    assert not pss.any_query(Point(1, 1), Point(2, 1), Point(1, 3))
     assert pss.sorted_query(Point(1, 1), Point(6, 1), Point(1, 6)) == [items[5], items[4]]
     assert pss.sorted_query(Point(1, 1), Point(4, 1), Point(1, 1), items_limit=1) == [items[3]]
 
+    assert pss.max_in_range(Point(1, 1), Point(4, 1)) is items[3]
+    assert pss.skyline(Point(1, 1), Point(6, 1)) == [items[5]]
+    assert pss.skyline(Point(1, 1), Point(5, 1)) == [items[4]]
+    assert pss.pop_max_in_range(Point(1, 1), Point(2, 1)) is items[1]
+    assert items[1] not in pss
+    pss.add(items[1])
+    assert pss.pop_query(Point(1, 1), Point(4, 1), Point(1, 3)) == [items[3], items[2]]
+    assert items[2] not in pss
+    assert items[3] not in pss
+    pss.add(items[2])
+    pss.add(items[3])
+    assert pss.nlargest(2) == [items[5], items[4]]
+    assert pss.pushpop(Point(7, 7)).x == 7
+    assert pss.pushpop(Point(7, 0)) is items[5]
+    assert pss.replace_max(items[5]).x == 5
+    assert pss.pop_many(2) == [items[5], items[3]]
+    assert Point(7, 0) in pss
+    pss.remove(Point(7, 0))
+    pss.add(items[3])
+    pss.add(items[4])
+    pss.add(items[5])
+    remaining = pss.nlargest(len(pss))
+    drained = pss.drain()
+    assert next(drained) is items[5]
+    assert not pss
+    pss.add(Point(7, 0))
+    assert next(drained) is remaining[1]
+    drained.close()
+    assert len(pss) == 1
+    assert items[4] not in pss
+    pss.remove(Point(7, 0))
+    for item in remaining:
+        pss.add(item)
+    assert pss.min_key_query(Point(2, 1), Point(6, 1), Point(1, 3)) is items[2]
+    assert pss.max_key_query(Point(1, 1), Point(5, 1), Point(1, 3)) is items[4]
+
     assert items[2] in pss
     assert Point(10, 10) not in pss
     assert Point(2, 10) in pss
@@ -53,3 +97,19 @@ def test_priority_search_set():
         assert p.y == 4
     pss.clear()
     assert not pss
+
+
+def test_pushpop():
+    pss = PrioritySearchSet(key_func=lambda v: v[0], priority_func=lambda v: v[1])
+    assert pss.pushpop((1, 1)) == (1, 1)
+    assert not pss
+    pss.add((1, 1))
+    pss.add((2, 5))
+    pss.add((3, 3))
+    assert pss.pushpop((4, 6)) == (4, 6)
+    assert pss.pushpop((4, 4)) == (2, 5)
+    assert pss.pushpop((1, 7)) == (1, 7)
+    assert pss.pushpop((3, 0)) == (4, 4)
+    assert len(pss) == 1
+    assert pss.pop() == (3, 0)
+    assert_rb_tree(pss._pst._root)
@@ -7,6 +7,7 @@ from data import LARGE_PST_REMOVE_DATA
 from manual import stress
 from manual.stress import stress_test
 from priority_search_tree import PrioritySearchTree
+from utils import assert_index
 from utils import assert_rb_tree
 
 
@@ -16,6 +17,8 @@ def test_empty_pst():
     assert 1 not in pst
     result = pst.query(0, 1, 2)
     assert len(result) == 0
+    assert pst.count_query(0, 1, 2) == 0
+    assert not pst.any_query(0, 1, 2)
     with pytest.raises(KeyError, match="Key not found:"):
         _ = pst[1]
     with pytest.raises(KeyError, match="Key not found:"):
@@ -76,6 +79,168 @@ def test_get_max_priority():
     assert pst.get_with_max_priority() == 5
 
 
+def test_max_in_range():
+    items = [(0, 0), (1, 6), (2, 1), (3, 7), (4, 4), (5, 2), (6, 3), (7, 5), (8, 8)]
+    pst = PrioritySearchTree(items)
+    for x_min in range(-1, 10):
+        for x_max in range(x_min, 10):
+            tmp = [item for item in items if x_min <= item[0] <= x_max]
+            if tmp:
+                assert pst.max_in_range(x_min, x_max) == max(tmp, key=lambda x: (x[1], x[0]))[0]
+            else:
+                with pytest.raises(KeyError, match="No keys in range:"):
+                    pst.max_in_range(x_min, x_max)
+    with pytest.raises(KeyError, match="No keys in range:"):
+        PrioritySearchTree().max_in_range(0, 1)
+
+
+def test_bucket_maxima():
+    items = [(x, (x * 7) % 11) for x in range(50)]
+    pst = PrioritySearchTree(items)
+    for x_min, x_max, boundaries in [(0, 49, [10, 20, 30, 40]), (5, 44, [5, 6, 7, 30]), (-5, 100, [0, 49, 50]), (3, 3, [])]:
+        result = pst.bucket_maxima(x_min, x_max, boundaries)
+        edges = [x_min, *boundaries]
+        expected = []
+        for i, edge in enumerate(edges):
+            in_bucket = [x for x in items if edge <= x[0] <= x_max and (i + 1 == len(edges) or x[0] < edges[i + 1])]
+            expected.append(max(in_bucket, key=lambda x: (x[1], x[0]))[0] if in_bucket else None)
+        assert result == expected
+    assert PrioritySearchTree().bucket_maxima(0, 10, [5]) == [None, None]
+    assert pst.bucket_maxima(0, 10, [10]) == [max(range(10), key=lambda x: (items[x][1], x)), 10]
+    for x_min, x_max, boundaries in [(0, 10, [20]), (5, 10, [3]), (0, 30, [20, 10])]:
+        with pytest.raises(ValueError, match="Boundaries must be sorted and within range"):
+            pst.bucket_maxima(x_min, x_max, boundaries)
+
+
+def test_skyline():
+    items = [(0, 0), (1, 6), (2, 1), (3, 7), (4, 4), (5, 2), (6, 3), (7, 5), (8, 8), (9, 5), (10, 2), (11, 5)]
+    pst = PrioritySearchTree(items)
+    for x_min in range(-1, 13):
+        for x_max in range(x_min, 13):
+            in_range = [x for x in items if x_min <= x[0] <= x_max]
+            expected = [
+                x[0]
+                for x in sorted(in_range, key=lambda x: x[1], reverse=True)
+                if not any(y != x and y[0] >= x[0] and y[1] >= x[1] for y in in_range)
+            ]
+            assert pst.skyline(x_min, x_max) == expected
+
+
+def test_pop_max_in_range():
+    items = [(0, 0), (1, 6), (2, 1), (3, 7), (4, 4), (5, 2), (6, 3), (7, 5), (8, 8)]
+    pst = PrioritySearchTree(items)
+    assert pst.pop_max_in_range(2, 6) == (3, 7)
+    assert pst.pop_max_in_range(2, 6) == (4, 4)
+    assert pst.pop_max_in_range(0, 8) == (8, 8)
+    assert_rb_tree(pst._root)
+    assert len(pst) == 6
+    assert sorted(pst.items()) == [(0, 0), (1, 6), (2, 1), (5, 2), (6, 3), (7, 5)]
+    assert pst.pop_max_in_range(2, 2) == (2, 1)
+    with pytest.raises(KeyError, match="No keys in range:"):
+        pst.pop_max_in_range(2, 4)
+    while pst:
+        pst.pop_max_in_range(0, 8)
+        assert_rb_tree(pst._root)
+    with pytest.raises(KeyError, match="No keys in range:"):
+        pst.pop_max_in_range(0, 8)
+
+
+def test_pop_query():
+    items = [(x, (x * 7) % 100) for x in range(100)]
+    pst = PrioritySearchTree(items)
+    assert sorted(pst.pop_query(10, 40, 50)) == [x for x in items if 10 <= x[0] <= 40 and x[1] >= 50]
+    assert_rb_tree(pst._root)
+    assert pst.pop_query(10, 40, 50) == []
+    assert sorted(pst.items()) == [x for x in items if not (10 <= x[0] <= 40 and x[1] >= 50)]
+    remaining = [x for x in pst.items() if not x[1] >= 10]
+    pst.pop_query(0, 99, 10)
+    assert_rb_tree(pst._root)
+    assert sorted(pst.items()) == sorted(remaining)
+    assert sorted(pst.pop_query(0, 99, 0)) == sorted(remaining)
+    assert not pst
+    assert pst.pop_query(0, 99, 0) == []
+
+
+def test_prune():
+    items = [(x, (x * 7) % 100) for x in range(100)]
+    pst = PrioritySearchTree(items)
+    assert pst.prune(10, 40, 50) == len([x for x in items if 10 <= x[0] <= 40 and x[1] < 50])
+    assert_rb_tree(pst._root)
+    assert pst.prune(10, 40, 50) == 0
+    assert sorted(pst.items()) == [x for x in items if not (10 <= x[0] <= 40 and x[1] < 50)]
+    remaining = [x for x in pst.items() if x[1] >= 90]
+    removed_count = len(pst) - len(remaining)
+    assert pst.prune(0, 99, 90) == removed_count
+    assert_rb_tree(pst._root)
+    assert sorted(pst.items()) == sorted(remaining)
+    pst.prune(0, 99, 100)
+    assert not pst
+    assert pst.prune(0, 99, 100) == 0
+
+    pst = PrioritySearchTree(items, indexed=True)
+    assert pst.prune(0, 99, 20) == 20
+    assert_rb_tree(pst._root)
+    assert_index(pst)
+    assert sorted(pst.items()) == [x for x in items if x[1] >= 20]
+    assert sorted(pst.query(0, 99, 90)) == sorted(x[0] for x in items if x[1] >= 90)
+    assert pst.popitem() == (57, 99)
+
+
+def test_iter_by_priority():
+    items = [(x, (x * 7) % 100) for x in range(100)]
+    pst = PrioritySearchTree(items)
+    by_priority = sorted(items, key=lambda x: (x[1], x[0]), reverse=True)
+    assert list(pst.iter_by_priority()) == by_priority
+    assert list(pst.iter_by_priority(10, 40)) == [x for x in by_priority if 10 <= x[0] <= 40]
+    assert list(pst.iter_by_priority(key_left=90)) == [x for x in by_priority if x[0] >= 90]
+    assert list(pst.iter_by_priority(key_right=9)) == [x for x in by_priority if x[0] <= 9]
+    result = pst.iter_by_priority()
+    assert next(result) == (57, 99)
+    assert len(pst) == 100
+    assert list(PrioritySearchTree().iter_by_priority()) == []
+
+
+def test_drain():
+    items = [(x, (x * 7) % 100) for x in range(100)]
+    by_priority = sorted(items, key=lambda x: (x[1], x[0]), reverse=True)
+    pst = PrioritySearchTree(items)
+    assert list(pst.drain()) == by_priority
+    assert not pst
+    assert list(pst.drain()) == []
+
+    pst = PrioritySearchTree(items)
+    result = pst.drain()
+    assert [next(result) for _ in range(10)] == by_priority[:10]
+    assert not pst
+    result.close()
+    assert not pst
+
+    pst = PrioritySearchTree(items)
+    result = pst.drain()
+    assert next(result) == by_priority[0]
+    pst[100] = 1
+    pst[by_priority[5][0]] = 2
+    assert next(result) == by_priority[1]
+    result.close()
+    assert_rb_tree(pst._root)
+    assert sorted(pst.items()) == [(by_priority[5][0], 2), (100, 1)]
+
+
+def test_nearest_query():
+    items = [(0, 0), (2, 6), (4, 1), (6, 7), (8, 4), (10, 2), (12, 3), (14, 5), (16, 8)]
+    pst = PrioritySearchTree(items)
+    for key in range(-2, 19):
+        for y_min in range(10):
+            keys = [x[0] for x in items if x[1] >= y_min]
+            if keys:
+                assert pst.nearest_query(key, y_min) == min(keys, key=lambda x: (abs(x - key), x))
+            else:
+                with pytest.raises(KeyError, match="No items satisfy criteria"):
+                    pst.nearest_query(key, y_min)
+    with pytest.raises(KeyError, match="No items satisfy criteria"):
+        PrioritySearchTree().nearest_query(1, 1)
+
+
 def test_contains():
     items = [(1, 1), (2, 2), (3, 4), (4, 4)]
     pst = PrioritySearchTree(items)
@@ -100,6 +265,50 @@ def test_large_pst():
         assert_rb_tree(pst._root)
 
 
+def test_indexed_pst():
+    pst = PrioritySearchTree(LARGE_PST_INITIAL_DATA, indexed=True)
+    assert_index(pst)
+    for itm in LARGE_PST_ADD_DATA:
+        pst[itm[0]] = itm[1]
+    assert_index(pst)
+    for itm in LARGE_PST_REMOVE_DATA:
+        assert itm in pst
+        del pst[itm]
+        assert itm not in pst
+    assert_rb_tree(pst._root)
+    assert_index(pst)
+    for key in list(pst)[::3]:
+        assert pst.update_priority(key, pst[key] + 1000) + 1000 == pst[key]
+    assert_index(pst)
+    for _ in range(50):
+        pst.popitem()
+    assert_index(pst)
+    plain = PrioritySearchTree(pst.items())
+    assert pst.sorted_query(0, 10**9, 0) == plain.sorted_query(0, 10**9, 0)
+    pst.pop_query(0, 10**9, plain.sorted_query(0, 10**9, 0)[len(pst) // 3])
+    assert_index(pst)
+    pst.prune(0, 10**9, max(pst.values()))
+    assert_index(pst)
+    handles = list(pst._index.values())
+    result = pst.drain()
+    next(result)
+    assert_index(pst)
+    assert all(handle.node is None for handle in handles)
+    pst[1] = 1
+    assert_index(pst)
+    result.close()
+    assert list(pst.items()) == [(1, 1)]
+    assert_index(pst)
+    pst.clear()
+    assert 1 not in pst
+    pst[1] = 1
+    assert_index(pst)
+    with pytest.raises(KeyError, match="Key not found:"):
+        _ = pst[2]
+    with pytest.raises(KeyError, match="Key not found:"):
+        pst.update_priority(2, 2)
+
+
 def test_query():
     items = [(0, 0), (1, 6), (2, 1), (3, 7), (4, 4), (5, 2), (6, 3), (7, 5), (8, 8)]
     pst = PrioritySearchTree(items)
@@ -112,7 +321,116 @@ def test_query():
                         tmp.append(item)
                 query_expected = [x[0] for x in sorted(tmp, key=lambda x: (x[1], x[0]), reverse=True)]
                 assert set(pst.query(x_min, x_max, y_min)) == set(query_expected)
+                assert list(pst.iquery(x_min, x_max, y_min)) == pst.query(x_min, x_max, y_min)
+                assert pst.count_query(x_min, x_max, y_min) == len(query_expected)
+                if query_expected:
+                    assert pst.min_key_query(x_min, x_max, y_min) == min(query_expected)
+                    assert pst.max_key_query(x_min, x_max, y_min) == max(query_expected)
+                else:
+                    with pytest.raises(KeyError, match="No items satisfy criteria"):
+                        pst.min_key_query(x_min, x_max, y_min)
+                    with pytest.raises(KeyError, match="No items satisfy criteria"):
+                        pst.max_key_query(x_min, x_max, y_min)
+                for limit in range(1, 4):
+                    result = pst.query(x_min, x_max, y_min, items_limit=limit)
+                    assert len(result) == min(limit, len(query_expected))
+                    assert set(result) <= set(query_expected)
+                assert pst.any_query(x_min, x_max, y_min) == bool(query_expected)
                 assert pst.sorted_query(x_min, x_max, y_min) == query_expected
+                with_priority_expected = sorted(tmp, key=lambda x: (x[1], x[0]), reverse=True)
+                assert pst.sorted_query(x_min, x_max, y_min, with_priority=True) == with_priority_expected
+                assert set(pst.query(x_min, x_max, y_min, with_priority=True)) == set(with_priority_expected)
+                assert set(pst.iquery(x_min, x_max, y_min, with_priority=True)) == set(with_priority_expected)
+                assert pst.ordered_query(x_min, x_max, y_min, with_priority=True) == sorted(with_priority_expected)
+
+
+def test_iquery_stops_early():
+    pst = PrioritySearchTree((i, i) for i in range(100))
+    result = pst.iquery(0, 99, 50)
+    assert next(result) == 99
+    assert 50 <= next(result) < 99
+    pst_iter = pst.iquery(0, 99, 50)
+    assert len(list(pst_iter)) == 50
+    assert next(pst_iter, None) is None
+    assert list(PrioritySearchTree().iquery(0, 1, 0)) == []
+
+
+def test_ordered_query():
+    items = [(0, 0), (1, 6), (2, 1), (3, 7), (4, 4), (5, 2), (6, 3), (7, 5), (8, 8)]
+    pst = PrioritySearchTree(items)
+    for x_min in range(10):
+        for x_max in range(x_min, 10):
+            for y_min in range(10):
+                query_expected = [x[0] for x in items if x_min <= x[0] <= x_max and x[1] >= y_min]
+                assert pst.ordered_query(x_min, x_max, y_min) == query_expected
+                assert pst.ordered_query(x_min, x_max, y_min, reverse=True) == query_expected[::-1]
+                for limit in range(1, 4):
+                    assert pst.ordered_query(x_min, x_max, y_min, items_limit=limit) == query_expected[:limit]
+                for after_key in range(10):
+                    result = pst.ordered_query(x_min, x_max, y_min, after_key=after_key)
+                    assert result == [x for x in query_expected if x > after_key]
+                    result = pst.ordered_query(x_min, x_max, y_min, after_key=after_key, reverse=True)
+                    assert result == [x for x in reversed(query_expected) if x < after_key]
+
+
+def test_ordered_query_pagination():
+    pst = PrioritySearchTree((i, i % 7) for i in range(1000))
+    expected = [i for i in range(100, 901) if i % 7 >= 3]
+    result = []
+    page = pst.ordered_query(100, 900, 3, items_limit=50)
+    while page:
+        assert len(page) <= 50
+        result.extend(page)
+        page = pst.ordered_query(100, 900, 3, items_limit=50, after_key=page[-1])
+    assert result == expected
+
+
+def test_query_many():
+    items = [(0, 0), (1, 6), (2, 1), (3, 7), (4, 4), (5, 2), (6, 3), (7, 5), (8, 8)]
+    pst = PrioritySearchTree(items)
+    queries = [(x_min, x_max, y_min) for x_min in range(10) for x_max in range(x_min, 10) for y_min in range(10)]
+    assert pst.query_many(queries) == [pst.query(*x) for x in queries]
+    assert pst.query_many(reversed(queries)) == [pst.query(*x) for x in reversed(queries)]
+    assert pst.query_many([]) == []
+    assert PrioritySearchTree().query_many([(0, 1, 0), (1, 2, 0)]) == [[], []]
+
+
+def test_query_arrays():
+    numpy = pytest.importorskip("numpy")
+    items = [(0, 0), (1, 6), (2, 1), (3, 7), (4, 4), (5, 2), (6, 3), (7, 5), (8, 8)]
+    pst = PrioritySearchTree(items)
+    queries = [(x_min, x_max, y_min) for x_min in range(10) for x_max in range(x_min, 10) for y_min in range(10)]
+    lefts, rights, bottoms = (numpy.array(x) for x in zip(*queries))
+    keys, offsets = pst.query_arrays(lefts, rights, bottoms)
+    assert keys.dtype.kind == "i"
+    assert len(offsets) == len(queries) + 1
+    for i, query in enumerate(queries):
+        assert keys[offsets[i] : offsets[i + 1]].tolist() == pst.query(*query)
+
+    keys, offsets = pst.query_arrays(numpy.array([]), numpy.array([]), numpy.array([]))
+    assert len(keys) == 0
+    assert offsets.tolist() == [0]
+    with pytest.raises(ValueError, match="must have the same length"):
+        pst.query_arrays(numpy.array([1]), numpy.array([1, 2]), numpy.array([1]))
+
+    pst = PrioritySearchTree([(0.5, 0), (1.5, 1), (2.5, 2)])
+    keys, offsets = pst.query_arrays(numpy.array([0]), numpy.array([3]), numpy.array([0]))
+    assert sorted(keys.tolist()) == [0.5, 1.5, 2.5]
+    pst = PrioritySearchTree([(1000, 0), (2000, 1)])
+    keys, offsets = pst.query_arrays(numpy.array([0], dtype=numpy.int8), numpy.array([100], dtype=numpy.int8), numpy.array([0]))
+    assert len(keys) == 0
+    assert keys.dtype == numpy.int8
+    keys, offsets = pst.query_arrays(numpy.array([0], dtype=numpy.int8), numpy.array([3000]), numpy.array([0]))
+    assert sorted(keys.tolist()) == [1000, 2000]
+    assert keys.dtype.kind == "i"
+    keys, offsets = pst.query_arrays(numpy.array([0]), numpy.array([3000]), numpy.array([5]))
+    assert len(keys) == 0
+    assert keys.dtype == numpy.array([0]).dtype
+    keys, offsets = pst.query_arrays(numpy.array([0]), numpy.array([3000]), numpy.array([5]), dtype=numpy.int32)
+    assert keys.dtype == numpy.int32
+    keys, offsets = pst.query_arrays(numpy.array([0]), numpy.array([3000]), numpy.array([0]), dtype=numpy.int32)
+    assert keys.dtype == numpy.int32
+    assert sorted(keys.tolist()) == [1000, 2000]
 
 
 def test_iterator():
@@ -145,6 +463,18 @@ def test_sorted_query_limit():
     assert result == [8, 3, 1, 7, 4, 6, 5, 2, 0]
 
 
+def test_sorted_query_limit_window():
+    items = [(0, 0), (1, 6), (2, 1), (3, 7), (4, 4), (5, 2), (6, 3), (7, 5), (8, 8)]
+    pst = PrioritySearchTree(items)
+    for x_min in range(10):
+        for x_max in range(x_min, 10):
+            for y_min in range(10):
+                tmp = [item for item in items if x_min <= item[0] <= x_max and item[1] >= y_min]
+                query_expected = [x[0] for x in sorted(tmp, key=lambda x: (x[1], x[0]), reverse=True)]
+                for limit in range(1, 4):
+                    assert pst.sorted_query(x_min, x_max, y_min, items_limit=limit) == query_expected[:limit]
+
+
 def test_stress_tester():
     stress_test()
     stress.NUM_OF_ITEMS = 1
@@ -166,6 +496,92 @@ def test_update_priority():
         PrioritySearchTree([(1, 1), (1, 2)])
 
 
+def test_item_handles():
+    pst = PrioritySearchTree([(x, x) for x in range(0, 100, 2)])
+    with pytest.raises(ValueError, match="indexed=True"):
+        pst.insert(1, 1)
+    assert 1 not in pst
+    pst = PrioritySearchTree([(x, x) for x in range(0, 100, 2)], indexed=True)
+    handles = {x: pst.insert(x, 100 - x) for x in range(1, 100, 2)}
+    assert_index(pst)
+    assert pst.insert(1, 100) is handles[1]
+    for key, handle in handles.items():
+        assert handle.key == key
+        assert pst.update_priority(handle, key + 100) == (100 if key == 1 else 100 - key)
+    assert_index(pst)
+    assert pst.sorted_query(0, 99, 101) == list(range(99, 0, -2))
+    for key in range(1, 50, 2):
+        del pst[handles[key]]
+        assert key not in pst
+        assert handles[key].node is None
+    assert_rb_tree(pst._root)
+    assert_index(pst)
+    assert len(pst) == 75
+    with pytest.raises(KeyError, match="Key not found:1"):
+        del pst[handles[1]]
+    with pytest.raises(KeyError, match="Key not found:1"):
+        pst.update_priority(handles[1], 1)
+    pst.clear()
+    assert handles[99].node is None
+
+
+def test_update_priority_increase_decrease():
+    items = {x: (x * 7) % 100 for x in range(100)}
+    pst = PrioritySearchTree(items.items())
+    for key in range(0, 100, 3):
+        for delta in (1, 30, -1, -30, 200, -200):
+            assert pst.update_priority(key, items[key] + delta) == items[key]
+            items[key] += delta
+            assert list(pst.iter_by_priority()) == sorted(items.items(), key=lambda x: (x[1], x[0]), reverse=True)
+    assert_rb_tree(pst._root)
+
+
+def test_heap_operations():
+    items = [(x, (x * 7) % 100) for x in range(100)]
+    by_priority = sorted(items, key=lambda x: (x[1], x[0]), reverse=True)
+    pst = PrioritySearchTree(items)
+    assert pst.nlargest(3) == by_priority[:3]
+    assert pst.nlargest(0) == []
+    assert pst.nlargest(200) == by_priority
+    assert len(pst) == 100
+    assert pst.pushpop(100, 1000) == (100, 1000)
+    assert 100 not in pst
+    assert pst.pushpop(100, 1) == by_priority[0]
+    assert pst.pushpop(by_priority[1][0], 1000) == (by_priority[1][0], 1000)
+    assert by_priority[1][0] not in pst
+    assert pst.replace_max(101, 2) == by_priority[2]
+    assert pst.replace_max(by_priority[3][0], 0) == by_priority[3]
+    assert pst[by_priority[3][0]] == 0
+    assert pst[100] == 1
+    assert pst[101] == 2
+    assert len(pst) == 99
+    assert_rb_tree(pst._root)
+    assert pst.pop_many(3) == by_priority[4:7]
+    assert_rb_tree(pst._root)
+    assert len(pst.pop_many(90)) == 90
+    assert_rb_tree(pst._root)
+    remaining = sorted(pst.items(), key=lambda x: (x[1], x[0]), reverse=True)
+    assert pst.pop_many(10) == remaining
+    assert not pst
+    assert pst.pushpop(1, 1) == (1, 1)
+    assert pst.pop_many(1) == []
+    with pytest.raises(KeyError):
+        pst.replace_max(1, 1)
+
+    pst = PrioritySearchTree(items, indexed=True)
+    assert pst.replace_max(by_priority[5][0], 1000) == by_priority[0]
+    assert pst.replace_max(200, 0) == (by_priority[5][0], 1000)
+    assert pst.pushpop(201, 1) == by_priority[1]
+    assert len(pst) == 99
+    assert sorted(pst.items()) == sorted(by_priority[2:5] + by_priority[6:] + [(200, 0), (201, 1)])
+    assert_rb_tree(pst._root)
+    assert_index(pst)
+    pst = PrioritySearchTree([(1, 1)], indexed=True)
+    assert pst.replace_max(2, 2) == (1, 1)
+    assert list(pst.items()) == [(2, 2)]
+    assert_index(pst)
+
+
 def test_not_unique_priorities():
     pst = PrioritySearchTree()
     for i in range(100, -1, -1):
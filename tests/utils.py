@@ -14,3 +14,10 @@ def assert_rb_tree(node):
     rl = assert_rb_tree(node.left)
     assert rr == rl
     return result + rr
+
+
+def assert_index(pst):
+    assert len(pst._index) == len(pst)
+    for key, handle in pst._index.items():
+        assert handle.key == key
+        assert handle.node.heap_key[1] == key